@@ -1,18 +1,23 @@
+from __future__ import annotations
+
 import streamlit as st
 import logging
 import traceback
 import os
-import torch
 
-from typing import Optional, List
-from src.models import DocumentFile
+from typing import Optional, List, Tuple, TYPE_CHECKING
 from src.utils.logger import get_logger, setup_logging
 
 from src.config.config_manager import ConfigurationError, ConfigManager
 from src.config.models import AppConfig
-from src.utils import DomainManager, SQLiteManager 
-from src.data_ingestion import DataIngestionOrchestrator
-from src.query_processing import QueryOrchestrator
+
+# Os componentes do backend (torch, sentence-transformers, faiss, langchain) são importados
+# dentro das factories cacheadas, para não bloquear a primeira renderização das páginas
+if TYPE_CHECKING:
+    from src.models import DocumentFile
+    from src.utils import DomainManager, SQLiteManager, ChatHistoryManager
+    from src.data_ingestion import DataIngestionOrchestrator
+    from src.query_processing import QueryOrchestrator
 
 logger = get_logger(__name__, log_domain="streamlit_utils")
 
@@ -22,20 +27,43 @@ def get_config_manager() -> ConfigManager:
     logger.info("Criando e cacheando instância ConfigManager para o caminho padrão.")
     return ConfigManager()
 
-@st.cache_data # Cacheia os dados carregados
 def load_configuration() -> Optional[AppConfig]:
-    """Carrega a configuração da aplicação usando o ConfigManager cacheado e cacheia os dados."""
-    logger.info("Tentando carregar a configuração da aplicação (dados cacheados)")
+    """
+    Carrega a configuração da aplicação usando o ConfigManager cacheado.
+    
+    O cache é indexado pelo mtime do arquivo de configuração: o arquivo só é relido e validado
+    quando é alterado (ex: após save_config, reset_config ou restore_config_from_backup),
+    sem necessidade de limpar o cache explicitamente.
+    """
+    manager = get_config_manager()
+    try:
+        config_mtime_ns = os.stat(manager.config_path).st_mtime_ns
+    except OSError:
+        # Arquivo ausente: deixa o load_config reportar o erro
+        config_mtime_ns = 0
+    config = _load_configuration_cached(config_mtime_ns)
+
+    # O status do CUDA é registrado na session state de cada sessão, fora da função cacheada
+    if 'cuda_available' not in st.session_state:
+        st.session_state['cuda_available'] = is_cuda_available()
+    return config
+
+@st.cache_resource
+def is_cuda_available() -> bool:
+    """Verifica (uma vez por processo) se há uma GPU CUDA disponível."""
+    import torch
+    cuda_status = torch.cuda.is_available()
+    logger.info(f"CUDA Availability Check: {cuda_status}")
+    return cuda_status
+
+@st.cache_resource(max_entries=1) # Mantém apenas a versão mais recente do arquivo
+def _load_configuration_cached(config_mtime_ns: int) -> Optional[AppConfig]:
+    """Carrega a configuração da aplicação para um determinado mtime do arquivo de configuração."""
+    logger.info(f"Tentando carregar a configuração da aplicação (mtime: {config_mtime_ns})")
     try:
         manager = get_config_manager()
         config = manager.load_config()
         logger.info("Configuração carregada com sucesso.")
-        
-        # Check CUDA availability and store in session state
-        cuda_status = torch.cuda.is_available()
-        st.session_state['cuda_available'] = cuda_status
-        logger.info(f"CUDA Availability Check: {cuda_status}")
-        
         return config
     except ConfigurationError as e:
         logger.error(f"Falha ao carregar configuração: {e}", exc_info=True)
@@ -54,6 +82,7 @@ def load_configuration() -> Optional[AppConfig]:
 def get_domain_manager(_config: AppConfig) -> Optional[DomainManager]:
     """Cria uma instância DomainManager usando a configuração carregada."""
     logger.info("Criando instância DomainManager (cacheada)")
+    from src.utils import DomainManager, SQLiteManager
     sqlite_manager = SQLiteManager(_config.system)
     if not _config:
         logger.error("Não é possível criar DomainManager: Objeto de configuração é None.")
@@ -75,6 +104,7 @@ def get_sqlite_manager(_config: AppConfig) -> Optional[SQLiteManager]:
         logger.error("Não é possível criar SQLiteManager: Objeto de configuração é None.")
         return None
     try:
+        from src.utils import SQLiteManager
         return SQLiteManager(_config.system)
     except Exception as e:
         logger.error(f"Erro ao criar instancia do SQLiteManager: {e}", exc_info=True)
@@ -91,6 +121,7 @@ def get_data_ingestion_orchestrator(_config: AppConfig) -> Optional[DataIngestio
         logger.error("Não é possível criar DataIngestionOrchestrator: Objeto de configuração é None.")
         return None
     try:
+        from src.data_ingestion import DataIngestionOrchestrator
         return DataIngestionOrchestrator(config=_config)
     except Exception as e:
         logger.error(f"Falha ao criar instância do DataIngestionOrchestrator: {e}", exc_info=True)
@@ -108,6 +139,7 @@ def get_query_orchestrator(_config: AppConfig) -> Optional[QueryOrchestrator]:
         logger.error("Não é possível criar QueryOrchestrator: Objeto de configuração é None.")
         return None
     try:
+        from src.query_processing import QueryOrchestrator
         return QueryOrchestrator(config=_config)
     except Exception as e:
         logger.error(f"Falha ao criar instância do QueryOrchestrator: {e}", exc_info=True)
@@ -116,6 +148,23 @@ def get_query_orchestrator(_config: AppConfig) -> Optional[QueryOrchestrator]:
         st.stop()
         return None
 
+@st.cache_resource
+def get_chat_history_manager(_config: AppConfig) -> Optional[ChatHistoryManager]:
+    """Cria uma instância ChatHistoryManager usando a configuração carregada e cacheia a instância."""
+    logger.info("Criando instância ChatHistoryManager (cacheada)")
+    if not _config:
+        logger.error("Não é possível criar ChatHistoryManager: Objeto de configuração é None.")
+        return None
+    try:
+        from src.utils import ChatHistoryManager
+        return ChatHistoryManager(_config.system, log_domain="gui")
+    except Exception as e:
+        logger.error(f"Erro ao criar instancia do ChatHistoryManager: {e}", exc_info=True)
+        st.error(f"Erro ao inicializar o ChatHistoryManager: {e}")
+        st.code(traceback.format_exc())
+        st.stop()
+        return None
+
 
 @st.cache_resource
 def initialize_logging_session():
@@ -165,6 +214,45 @@ def update_log_levels_callback():
 
 # --- Domain/Document Specific Helpers ---
 
+def load_query_domain_options(domain_manager: DomainManager) -> Tuple[str, ...]:
+    """
+    Retorna as opções de domínio da página de busca: "Auto" seguido dos domínios com arquivo DB, em ordem alfabética.
+
+    Assim como load_configuration, o cache é indexado pelo mtime do banco de controle: a lista só é
+    recalculada (e reordenada) quando um domínio é criado, alterado, removido ou recebe uma ingestão.
+    """
+    try:
+        control_db_mtime_ns = os.stat(domain_manager.sqlite_manager.control_db_path).st_mtime_ns
+    except OSError:
+        # Banco de controle ainda não criado: list_domains o inicializa
+        control_db_mtime_ns = 0
+    return _load_query_domain_options_cached(control_db_mtime_ns, domain_manager)
+
+@st.cache_data(max_entries=1)
+def _load_query_domain_options_cached(control_db_mtime_ns: int, _domain_manager: DomainManager) -> Tuple[str, ...]:
+    """Lista e filtra os domínios com arquivo DB para um determinado mtime do banco de controle."""
+    logger = get_logger(__name__, log_domain="gui/utils")
+    all_domains = _domain_manager.list_domains()
+    if not all_domains:
+        logger.info("Nenhum dominio encontrado no banco de controle.")
+        return ("Auto",)
+
+    valid_domain_names = []
+    for domain in all_domains:
+        # Verifica se o dominio tem um arquivo DB
+        if domain.db_path and os.path.exists(domain.db_path):
+            valid_domain_names.append(domain.name)
+
+        # Se o dominio tem um db_path mas nao tem um arquivo DB
+        elif domain.db_path:
+            logger.debug(f"Dominio '{domain.name}' listado mas armazenamento nao inicializado em: {domain.db_path}")
+
+        # Se o dominio nao tem um db_path, declara erro de registro
+        else:
+            logger.error(f"Dominio '{domain.name}' nao tem um db_path definido: Erro de registro. Necessario refazer ou remover o registro do dominio.")
+    logger.info(f"Encontrados {len(valid_domain_names)} dominios com arquivos DB existentes.")
+    return ("Auto", *sorted(valid_domain_names))
+
 def get_domain_documents(domain_manager, domain_name: str) -> List[DocumentFile]:
     """Retorna a lista de DocumentFile para um domínio específico."""
     logger = get_logger(__name__, log_domain="gui/utils")
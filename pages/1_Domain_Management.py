@@ -39,7 +39,7 @@ if 'selected_domain_name' not in st.session_state:
 st.title("🧠 Gerenciamento de Domínios de Conhecimento")
 
 # --- Sidebar Debug Toggle --- 
-logger.info(f"--- DEBUG Domain Management: Renderizando toggle, estado é {st.session_state.get('debug_mode', 'Nao definido ainda')} ---")
+logger.debug("Renderizando toggle de debug", debug_mode=st.session_state.get('debug_mode'))
 st.sidebar.toggle(
     "Debug Logging", 
     key="debug_mode", 
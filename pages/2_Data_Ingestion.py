@@ -50,6 +50,9 @@ def handle_submission():
     st.info(f"Iniciando processo de ingestão para o domínio '{domain_name}' com o diretório '{dir_path}'. Aguarde...") # Give initial feedback
     logger.info("Iniciando ingestao de dados", selected_domain=domain_name, dir_path=dir_path)
     
+    # Trabalha sobre uma cópia: o objeto carregado é compartilhado pelo cache de configuração
+    config = load_configuration().model_copy(deep=True)
+
     # --- Atualiza as configurações de processamento de embeddings ---
     config.embedding.device = "cuda" if embedding_device == "gpu" else embedding_device
     config.embedding.batch_size = embedding_batch_size
@@ -114,7 +117,7 @@ if 'debug_mode' not in st.session_state:
 st.title("📥 Ingestão de Dados") 
 
 # --- Sidebar Debug Toggle --- 
-logger.info(f"--- DEBUG Data Ingestion: Rendering toggle, state is {st.session_state.get('debug_mode', 'Not Set Yet')} ---")
+logger.debug("Renderizando toggle de debug", debug_mode=st.session_state.get('debug_mode'))
 st.sidebar.toggle(
     "Debug Logging", 
     key="debug_mode", 
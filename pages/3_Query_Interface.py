@@ -1,6 +1,8 @@
 import streamlit as st
-import os
 import copy
+import uuid
+
+from collections import deque
 
 from pydantic import ValidationError
 
@@ -10,17 +12,31 @@ from gui.streamlit_utils import (
     get_domain_manager, 
     initialize_logging_session, 
     get_query_orchestrator, 
+    get_chat_history_manager,
     load_configuration,
+    load_query_domain_options,
     get_config_manager
 )
 from src.config.config_manager import ConfigurationError
-from src.config.models import LLMConfig, QueryConfig
 
 st.set_page_config(
     page_title="Query Interface",
     layout="wide"
 )
 
+# Número de mensagens mais recentes do histórico renderizadas individualmente com st.chat_message
+RECENT_MESSAGES_TO_RENDER = 6
+# Número máximo de mensagens mantidas em memória (session_state); o histórico completo fica no SQLite
+MAX_MESSAGES_IN_SESSION = 40
+# Valores iniciais das chaves simples da session state (o histórico e o id da sessão de chat são inicializados à parte)
+SESSION_STATE_DEFAULTS = {
+    "debug_mode": False,
+    "selected_query_domain": "Auto",
+    "confirming_config_reset": False,
+}
+# Rótulos exibidos para cada papel no bloco de histórico anterior
+CHAT_ROLE_LABELS = {"user": "Você", "assistant": "Assistente"}
+
 initialize_logging_session()
 logger = get_logger(__name__, log_domain="gui")
 
@@ -30,6 +46,7 @@ manager = get_config_manager()
 if config:
     domain_manager = get_domain_manager(config)
     orchestrator = get_query_orchestrator(config)
+    chat_history_manager = get_chat_history_manager(config)
 else:
     # Trata o caso onde a configuração falha para carregar early
     st.error("Failed to load application configuration. Cannot initialize components.")
@@ -42,55 +59,88 @@ if 'original_config' not in st.session_state or st.session_state.original_config
     logger.debug("Stored/Updated original_config in session state.")
 
 # --- Inicializa session state ---
-if 'debug_mode' not in st.session_state:
-    st.session_state.debug_mode = False
+for state_key, default_value in SESSION_STATE_DEFAULTS.items():
+    st.session_state.setdefault(state_key, default_value)
+if 'chat_session_id' not in st.session_state:
+    # O id da sessão de chat fica apenas no servidor (session_state); nunca é exposto na URL
+    st.session_state.chat_session_id = uuid.uuid4().hex
 if "messages" not in st.session_state:
-    st.session_state.messages = [] 
-if 'selected_query_domain' not in st.session_state:
-    st.session_state.selected_query_domain = "Auto" 
-if 'confirming_config_reset' not in st.session_state:
-    st.session_state.confirming_config_reset = False
+    try:
+        recent_messages = chat_history_manager.get_recent_messages(st.session_state.chat_session_id, MAX_MESSAGES_IN_SESSION)
+    except Exception as e:
+        logger.error(f"Erro ao carregar o historico de chat: {e}", exc_info=True)
+        recent_messages = []
+    st.session_state.messages = deque(recent_messages, maxlen=MAX_MESSAGES_IN_SESSION)
 if 'original_llm_config' not in st.session_state:
     st.session_state.original_llm_config = copy.deepcopy(config.llm)
 if 'original_query_config' not in st.session_state:
     st.session_state.original_query_config = copy.deepcopy(config.query)
+
+def append_chat_message(role: str, content: str) -> None:
+    """Adiciona uma mensagem ao histórico em memória e a persiste no banco do histórico de chat."""
+    st.session_state.messages.append({"role": role, "content": content})
+    try:
+        chat_history_manager.append_message(st.session_state.chat_session_id, role, content)
+    except Exception as e:
+        logger.error(f"Erro ao persistir mensagem no historico de chat: {e}", exc_info=True)
+
+def format_older_message(message: dict) -> str:
+    """Formata uma mensagem do histórico anterior como rótulo seguido do conteúdo em blockquote.
+
+    Cada linha do conteúdo recebe o prefixo '> ', de modo que markdown aberto em uma mensagem
+    (um bloco de código sem fechamento, por exemplo) termina com o blockquote e não afeta as seguintes.
+    """
+    label = CHAT_ROLE_LABELS.get(message["role"], message["role"])
+    quoted_content = "\n".join(f"> {line}" for line in message["content"].splitlines()) or ">"
+    return f"**{label}:**\n\n{quoted_content}"
+
+# --- Função de Callback para o botão 'Aplicar' do sidebar ---
+# Mapeia a key de cada widget do formulário para (seção, campo, valor exibido quando o campo é None)
+_sidebar_config_widgets = {
+    "sidebar_query_retrieval_k": ("query", "retrieval_k", None),
+    "sidebar_llm_model_repo_id": ("llm", "model_repo_id", None),
+    "sidebar_llm_prompt_template": ("llm", "prompt_template", None),
+    "sidebar_llm_max_new_tokens": ("llm", "max_new_tokens", None),
+    "sidebar_llm_temperature": ("llm", "temperature", None),
+    "sidebar_llm_top_p": ("llm", "top_p", 0.9),
+    "sidebar_llm_top_k": ("llm", "top_k", 50),
+    "sidebar_llm_repetition_penalty": ("llm", "repetition_penalty", 1.0),
+}
+
+def _displayed_config_value(section_config, field: str, widget_fallback):
+    """Retorna o valor exibido pelo widget para o campo, aplicando o mesmo fallback (`or`) usado na sua criação."""
+    value = getattr(section_config, field)
+    if widget_fallback is None:
+        return value
+    return value or widget_fallback
+
+def mark_config_dirty():
+    """Registra, por seção, apenas os campos cujo widget difere da configuração original."""
+    original_sections = {
+        "llm": st.session_state.original_llm_config,
+        "query": st.session_state.original_query_config,
+    }
+    config_changes = {}
+    for widget_key, (section, field, widget_fallback) in _sidebar_config_widgets.items():
+        widget_value = st.session_state.get(widget_key)
+        if widget_value != _displayed_config_value(original_sections[section], field, widget_fallback):
+            config_changes.setdefault(section, {})[field] = widget_value
+    st.session_state._config_changes = config_changes
+
 # --- Titulo da Página ---
 st.title("💬 Query Interface")
 
 # --- Configuração de seleção de domínio ---
 try:
-    
-    all_domains = domain_manager.list_domains()
-    
-    # Filtra apenas os domínios com um arquivo DB
-    valid_domain_names = []
-    if all_domains:
-        for domain in all_domains:
-            # Verifica se o dominio tem um arquivo DB
-            if domain.db_path and os.path.exists(domain.db_path):
-                # Adiciona o dominio a lista de dominios validos
-                valid_domain_names.append(domain.name)
-
-            # Se o dominio tem um db_path mas nao tem um arquivo DB
-            elif domain.db_path:
-                 logger.debug(f"Dominio '{domain.name}' listado mas armazenamento nao inicializado em: {domain.db_path}")
-
-            # Se o dominio nao tem um db_path, declara erro de registro
-            else:
-                 logger.error(f"Dominio '{domain.name}' nao tem um db_path definido: Erro de registro. Necessario refazer ou remover o registro do dominio.")
-        logger.info(f"Encontrados {len(valid_domain_names)} dominios com arquivos DB existentes.")
-    else:
-        logger.info("Nenhum dominio encontrado no banco de controle.")
-        
-    # Opcoes para o botao de seleção
-    domain_options = ["Auto"] + sorted(valid_domain_names)
-    
+    # Opcoes para o botao de seleção ("Auto" + dominios com arquivo DB, já ordenados e cacheados)
+    domain_options = load_query_domain_options(domain_manager)
+
 except Exception as e:
     logger.error("Erro ao carregar ou filtrar dominios para o sidebar.", error=str(e), exc_info=True)
     st.error(f"Erro ao carregar a lista de dominios: {e}")
     # Define opções padrão se o carregamento falhar
-    domain_options = ["Auto"] 
-    valid_domain_names = []
+    domain_options = ("Auto",)
+valid_domain_names = domain_options[1:]
 
 
 # --- Sidebar de seleção de dominio ---
@@ -98,7 +148,7 @@ with st.sidebar:
 
         
     # --- Sidebar Debug Toggle --- 
-    logger.info(f"--- Renderizando toggle, debug_mode = {st.session_state.get('debug_mode', 'Nao definido ainda')} ---")
+    logger.debug("Renderizando toggle de debug", debug_mode=st.session_state.get('debug_mode'))
     st.sidebar.toggle(
         "Debug Logging", 
         key="debug_mode",
@@ -108,10 +158,6 @@ with st.sidebar:
     )
     st.sidebar.divider()
     st.header("Opções de busca")
-    # Usa session state para manter o registro do dominio selecionado
-    if 'selected_query_domain' not in st.session_state:
-        st.session_state.selected_query_domain = "Auto" # Default to Auto
-
     selected_domain = st.radio(
         "Selecione o domínio de busca:",
         options=domain_options,
@@ -123,19 +169,73 @@ with st.sidebar:
 
     # --- Config Widgets ---
     st.header("Configuração de busca")
-    st.caption("Ajustes serão atualizados automaticamente ao enviar uma query.")
-    
-    st.header("Parâmetros da recuperação")
-    query_retrieval_k = st.number_input("K Documentos", min_value=1, step=1, value=config.query.retrieval_k, key="sidebar_query_retrieval_k", help="Número de documentos a serem recuperados para a query.")
+    st.caption("Ajustes são aplicados ao clicar em 'Aplicar'.")
     
-    st.header("Parâmetros do LLM")
-    llm_model_repo_id = st.text_input("Model Repo ID", value=config.llm.model_repo_id, key="sidebar_llm_model_repo_id")
-    llm_prompt_template = st.text_area("Prompt Template", value=config.llm.prompt_template, key="sidebar_llm_prompt_template", height=100)
-    llm_max_new_tokens = st.number_input("Max New Tokens", min_value=1, step=1, value=config.llm.max_new_tokens, key="sidebar_llm_max_new_tokens")
-    llm_temperature = st.slider("Temperature", min_value=0.0, max_value=2.0, step=0.01, value=config.llm.temperature, key="sidebar_llm_temperature")
-    llm_top_p = st.slider("Top P", min_value=0.0, max_value=1.0, step=0.01, value=config.llm.top_p or 0.9, key="sidebar_llm_top_p") 
-    llm_top_k = st.number_input("Top K", min_value=0, step=1, value=config.llm.top_k or 50, key="sidebar_llm_top_k")
-    llm_repetition_penalty = st.slider("Repetition Penalty", min_value=1.0, max_value=2.0, step=0.01, value=config.llm.repetition_penalty or 1.0, key="sidebar_llm_repetition_penalty")
+    # Os widgets ficam dentro de um form para que alterações (ex: arrastar um slider) não disparem um rerun a cada mudança
+    with st.form("llm_config_form", border=False):
+        st.header("Parâmetros da recuperação")
+        query_retrieval_k = st.number_input("K Documentos", min_value=1, step=1, value=config.query.retrieval_k, key="sidebar_query_retrieval_k", help="Número de documentos a serem recuperados para a query.")
+        
+        st.header("Parâmetros do LLM")
+        llm_model_repo_id = st.text_input("Model Repo ID", value=config.llm.model_repo_id, key="sidebar_llm_model_repo_id")
+        llm_prompt_template = st.text_area("Prompt Template", value=config.llm.prompt_template, key="sidebar_llm_prompt_template", height=100)
+        llm_max_new_tokens = st.number_input("Max New Tokens", min_value=1, step=1, value=config.llm.max_new_tokens, key="sidebar_llm_max_new_tokens")
+        llm_temperature = st.slider("Temperature", min_value=0.0, max_value=2.0, step=0.01, value=config.llm.temperature, key="sidebar_llm_temperature")
+        llm_top_p = st.slider("Top P", min_value=0.0, max_value=1.0, step=0.01, value=config.llm.top_p or _sidebar_config_widgets["sidebar_llm_top_p"][2], key="sidebar_llm_top_p") 
+        llm_top_k = st.number_input("Top K", min_value=0, step=1, value=config.llm.top_k or _sidebar_config_widgets["sidebar_llm_top_k"][2], key="sidebar_llm_top_k")
+        llm_repetition_penalty = st.slider("Repetition Penalty", min_value=1.0, max_value=2.0, step=0.01, value=config.llm.repetition_penalty or _sidebar_config_widgets["sidebar_llm_repetition_penalty"][2], key="sidebar_llm_repetition_penalty")
+
+        config_submitted = st.form_submit_button("Aplicar", type="primary", use_container_width=True, on_click=mark_config_dirty)
+
+    # --- Salva a configuração do LLM se tiver sido alterada --- 
+    if config_submitted:
+        config_changes = st.session_state.get("_config_changes")
+        if not config_changes:
+            logger.debug("Parâmetros não alterados, nada a salvar.")
+
+        else:
+            st.session_state._config_changes = {}
+            from src.config import LLMConfig, QueryConfig
+            try:
+                # Valida apenas as seções com campos alterados; as demais reaproveitam os modelos já validados
+                section_models = {"llm": LLMConfig, "query": QueryConfig}
+                updated_sections = {
+                    section: section_models[section].model_validate({**getattr(config, section).model_dump(), **changes})
+                    for section, changes in config_changes.items()
+                }
+                current_query_config = updated_sections.get("query", config.query)
+                current_llm_config = updated_sections.get("llm", config.llm)
+
+                logger.info("Parâmetros alterados no sidebar, salvando configuração...")
+            
+                # Cria uma cópia atualizada; o objeto carregado é compartilhado pelo cache de configuração
+                config = config.model_copy(update=updated_sections)
+            
+                # Pass the fully updated config to the orchestrator
+                logger.info("Atualizando o orchestrator com a nova configuração...")
+                orchestrator.update_config(config) 
+            
+                # Save the fully updated config object to the file
+                logger.info("Salvando a configuração atualizada no arquivo...")
+                manager.save_config(config)
+            
+                # Atualiza o estado da session com a nova configuração salva
+                logger.info("Atualizando a configuração original na session state...")
+                st.session_state.original_llm_config = copy.deepcopy(current_llm_config)
+                st.session_state.original_query_config = copy.deepcopy(current_query_config)
+            
+                st.toast("Configurações salvas!")
+
+            except ValidationError as e:
+                st.error(f"Erro de validação da configuração:\n{e}")
+
+            except ConfigurationError as e:
+                st.error(f"Erro ao salvar o arquivo de configuração:\n{e}")
+
+            except Exception as e:
+                st.error(f"Erro inesperado durante o salvamento da configuração do LLM:\n{e}")
+                logger.error("Erro durante o salvamento da configuração do LLM", exc_info=True)
+
     # --- Reset button --- 
     if not st.session_state.confirming_config_reset:
         if st.button("Reset Default", type="secondary", use_container_width=True, key="trigger_reset_button"):
@@ -158,7 +258,6 @@ with st.sidebar:
                         
                         manager.reset_config(current_full_config, sections_to_reset_now) 
                         
-                        load_configuration.clear()
                         st.session_state.confirming_config_reset = False
                         st.sidebar.success("Configurações restauradas para os valores padrão.")
                         st.rerun()
@@ -179,86 +278,40 @@ with st.sidebar:
     
     st.divider()
 
-
-# --- Gerenciamento do historico de chat ---
-if "messages" not in st.session_state:
-    st.session_state.messages = []
+    # --- Limpa o histórico de chat da sessão (memória e banco) ---
+    if st.button("Limpar histórico", use_container_width=True, key="clear_chat_history"):
+        try:
+            chat_history_manager.delete_session(st.session_state.chat_session_id)
+            st.session_state.messages.clear()
+            st.rerun()
+        except Exception as e:
+            logger.error(f"Erro ao limpar o historico de chat: {e}", exc_info=True)
+            st.error(f"Erro ao limpar o histórico de chat: {e}")
 
 # --- Exibe o historico de chat ---
 st.write("Chat History:")
 chat_container = st.container(height=400, border=False)
 with chat_container:
-    for message in st.session_state.messages:
+    # Mensagens antigas são renderizadas em um único bloco markdown; apenas as últimas usam st.chat_message
+    messages = list(st.session_state.messages)
+    older_messages = messages[:-RECENT_MESSAGES_TO_RENDER]
+    recent_messages = messages[-RECENT_MESSAGES_TO_RENDER:]
+    if older_messages:
+        with st.expander(f"Histórico anterior ({len(older_messages)} mensagens)", expanded=False):
+            st.markdown("\n\n".join(format_older_message(message) for message in older_messages))
+    for message in recent_messages:
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
 
 # --- Chat Input ---
 if prompt := st.chat_input("Pergunte aqui..."):
-    st.session_state.messages.append({"role": "user", "content": prompt})
+    append_chat_message("user", prompt)
 
     # Exibe a mensagem do usuario no container de mensagens de chat imediatamente
     with chat_container:
         with st.chat_message("user"):
             st.markdown(prompt)
 
-    # --- Salva automaticamente a configuração do LLM se tiver sido alterada --- 
-    try:
-        current_query_config = QueryConfig(retrieval_k=query_retrieval_k)
-        current_llm_config = LLMConfig(
-            model_repo_id=llm_model_repo_id,
-            prompt_template=llm_prompt_template,
-            max_new_tokens=llm_max_new_tokens,
-            temperature=llm_temperature,
-            top_p=llm_top_p,
-            top_k=llm_top_k,
-            repetition_penalty=llm_repetition_penalty,
-            max_retries=config.llm.max_retries, # Não é alterado nessa página
-            retry_delay_seconds=config.llm.retry_delay_seconds, # Não é alterado nessa página
-        )
-
-        if current_llm_config != st.session_state.original_llm_config or current_query_config != st.session_state.original_query_config:
-            logger.info("Parâmetros alterados no sidebar, salvando configuração automaticamente...")
-            
-            # Usa o objeto de configuração principal carregado no inicio da execução do script
-            if not config: 
-                 st.error("Não é possível salvar as alterações: Configuração principal não carregada.")
-            else:
-                # Atualiza o objeto de configuração carregado na memória diretamente
-                config.llm = current_llm_config
-                config.query = current_query_config
-                
-                # Pass the fully updated config to the orchestrator
-                logger.info("Atualizando o orchestrator com a nova configuração...")
-                orchestrator.update_config(config) 
-                
-                # Save the fully updated config object to the file
-                logger.info("Salvando a configuração atualizada no arquivo...")
-                manager.save_config(config)
-                
-                load_configuration.clear()
-                
-                # Atualiza o estado da session com a nova configuração salva
-                logger.info("Atualizando a configuração original na session state...")
-                st.session_state.original_llm_config = copy.deepcopy(current_llm_config)
-                st.session_state.original_query_config = copy.deepcopy(current_query_config)
-                
-                st.toast("Configurações salvas automaticamente!")
-        else:
-            logger.debug("Parâmetros não alterados, prosseguindo com a query.")
-
-    except ValidationError as e:
-        st.error(f"Erro de validação da configuração durante o salvamento automático:\n{e}")
-        st.stop()
-
-    except ConfigurationError as e:
-        st.error(f"Erro ao salvar o arquivo de configuração durante o salvamento automático:\n{e}")
-        st.stop()
-
-    except Exception as e:
-        st.error(f"Erro inesperado durante o salvamento automático da configuração do LLM:\n{e}")
-        logger.error("Erro durante o salvamento automático da configuração do LLM", exc_info=True)
-        st.stop()
-        
     # --- Processa a query --- 
     with chat_container:
         with st.chat_message("assistant"):
@@ -272,7 +325,8 @@ Pensando...""")
             
             try:
                 if selected_domain == "Auto":
-                    all_valid_domains = [domain.name for domain in all_domains if domain.name in valid_domain_names]
+                    # valid_domain_names já contém apenas os domínios com arquivo DB existente
+                    all_valid_domains = list(valid_domain_names)
                     logger.debug("Chamando query_llm em modo automatico (domain_names=None)")
                     response_data = orchestrator.query_llm(prompt, domain_names=all_valid_domains) 
                 else:
@@ -291,10 +345,10 @@ Pensando...""")
             message_placeholder.markdown(agent_answer)
             
     # Adiciona a resposta do assistente ao histórico de chat
-    st.session_state.messages.append({"role": "assistant", "content": agent_answer})
+    append_chat_message("assistant", agent_answer)
 
 # --- Exibe uma nota se nenhum dominio for encontrado ---
 if not valid_domain_names:
      st.sidebar.warning("Nenhum dominio com arquivos DB existentes encontrado. Por favor, ingerir dados primeiro.")
-     if "messages" not in st.session_state or not st.session_state.messages:
+     if not st.session_state.messages:
          st.info("Nenhum dominio disponível para consulta. Por favor, use a seção 'Ingestão de dados' para processar documentos em um domínio primeiro.") 
\ No newline at end of file
@@ -1,5 +1,5 @@
-from .config_manager import ConfigManager
+from .config_manager import ConfigManager, ConfigurationError
 from .models import AppConfig, SystemConfig, IngestionConfig, EmbeddingConfig, VectorStoreConfig, QueryConfig, LLMConfig, TextNormalizerConfig
 from .config_utils import check_config_changes
 
-__all__ = ["ConfigManager", "AppConfig", "SystemConfig", "IngestionConfig", "EmbeddingConfig", "VectorStoreConfig", "QueryConfig", "LLMConfig", "TextNormalizerConfig", "check_config_changes"]
\ No newline at end of file
+__all__ = ["ConfigManager", "ConfigurationError", "AppConfig", "SystemConfig", "IngestionConfig", "EmbeddingConfig", "VectorStoreConfig", "QueryConfig", "LLMConfig", "TextNormalizerConfig", "check_config_changes"]
\ No newline at end of file
@@ -1,13 +1,19 @@
-import sys
+import os
 from pathlib import Path
 import shutil 
+from functools import lru_cache
 from typing import Optional, List
-import tomlkit
-from tomlkit.items import Table, Item
+
+try:
+    # Leitura: o parser da stdlib (3.11+) é bem mais rápido que o tomlkit, que só é necessário para preservar comentários no save
+    import tomllib
+except ModuleNotFoundError:
+    tomllib = None
 
 from pydantic import ValidationError, BaseModel 
 
 from .models import AppConfig
+from .config_utils import check_config_changes
 from src.utils.logger import get_logger
 
 logger = get_logger(__name__, log_domain="config_manager")
@@ -21,6 +27,20 @@ _section_name_to_model = {
     if isinstance(model_info.annotation, type) and issubclass(model_info.annotation, BaseModel)
 }
 
+def _read_toml_data(path: Path) -> dict:
+    """Lê o arquivo TOML como dict. O tomlkit só é importado aqui no Python 3.10, que não tem tomllib."""
+    if tomllib is not None:
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    import tomlkit
+    with open(path, "rt", encoding="utf-8") as f:
+        return tomlkit.load(f).unwrap()
+
+@lru_cache(maxsize=None)
+def _section_default(section_name: str) -> BaseModel:
+    """Instância padrão da seção, construída (e validada) no primeiro reset dela; reset_config usa cópias."""
+    return _section_name_to_model[section_name]()
+
 class ConfigurationError(Exception):
     """Exceção personalizada para erros de carregamento/salvamento de configuração."""
     pass
@@ -40,7 +60,7 @@ class ConfigManager:
 
     def load_config(self) -> AppConfig:
         """
-        Carrega a configuração do arquivo TOML (preservando comentários via tomlkit),
+        Carrega a configuração do arquivo TOML (via tomllib; tomlkit no Python 3.10),
         valida usando Pydantic e retorna o objeto AppConfig.
         Uses the config_path defined during manager initialization.
 
@@ -57,21 +77,21 @@ class ConfigManager:
             raise ConfigurationError(msg)
 
         try:
-            logger.info(f"Carregando configuração de: {self.config_path} (com tomlkit)")
-            with open(self.config_path, "rt", encoding="utf-8") as f:
-                tomlkit_doc = tomlkit.load(f)
-            
-            config_data_dict = dict(tomlkit_doc) 
+            logger.info(f"Carregando configuração de: {self.config_path}")
+            try:
+                config_data_dict = _read_toml_data(self.config_path)
+            except ValueError as e: # TOMLDecodeError (tomllib) e ParseError (tomlkit) são subclasses de ValueError
+                msg = f"Erro ao analisar o arquivo de configuração {self.config_path}: {e}"
+                logger.error(msg)
+                raise ConfigurationError(msg) from e
             
             logger.debug("Dados de configuração convertidos para dict, validando com Pydantic...")
-            validated_config = AppConfig(**config_data_dict)
+            validated_config = AppConfig.model_validate(config_data_dict)
             logger.info("Configuração carregada e validada com sucesso.")
             return validated_config
 
-        except tomlkit.exceptions.ParseError as e:
-            msg = f"Erro ao analisar o arquivo de configuração {self.config_path} com tomlkit: {e}"
-            logger.error(msg)
-            raise ConfigurationError(msg) from e
+        except ConfigurationError:
+            raise
 
         except ValidationError as e:
             logger.error(f"Falha na validação da configuração Pydantic para {self.config_path}:\n{e}")
@@ -90,7 +110,7 @@ class ConfigManager:
         Raises:
             ConfigurationError: Se a configuração não puder ser carregada.
         """
-        logger.debug(f"Chamando self.load_config() para obter a configuração de {self.config_path}")
+        logger.debug("Chamando self.load_config() para obter a configuração", config_path=str(self.config_path))
         return self.load_config()
 
     def save_config(self, config: AppConfig) -> None:
@@ -98,6 +118,8 @@ class ConfigManager:
         Salva o objeto AppConfig fornecido no arquivo TOML gerenciado,
         preservando comentários e formatação existentes tanto quanto possível
         usando uma abordagem de atualização seção por seção.
+        Apenas as seções que diferem do arquivo atual são reescritas; se nenhuma
+        difere, o arquivo (e o backup) não são tocados.
 
         Args:
             config: O objeto AppConfig a ser salvo.
@@ -111,21 +133,17 @@ class ConfigManager:
             logger.error(msg)
             raise TypeError(msg)
 
+        # tomlkit (preserva comentários e formatação) só é necessário para escrita
+        import tomlkit
+        from tomlkit.items import Table, Item
+
         try:
             if not self.config_path.exists():
                 msg = f"Arquivo de configuração não encontrado em {self.config_path}. Não é possível salvar."
                 logger.error(msg)
                 raise ConfigurationError(msg)
 
-            # --- Backup Logic --- 
-            backup_path = self.get_backup_config_path()
-            try:
-                shutil.copy2(self.config_path, backup_path)
-                logger.info(f"Backup do arquivo de configuração criado em: {backup_path}")
-            except Exception as backup_e:
-                logger.warning(f"Falha ao criar backup do arquivo de configuração: {backup_e}")
-
-            # --- Load, Update, Save Logic ---
+            # --- Load Logic ---
             toml_doc: tomlkit.TOMLDocument
             try:
                 with open(self.config_path, "rt", encoding="utf-8") as f:
@@ -135,17 +153,30 @@ class ConfigManager:
                 logger.error(msg)
                 raise ConfigurationError(msg) from e
 
-            # Itera através das seções do AppConfig
+            # --- Compara com a configuração em disco; sem alterações, não há backup nem reescrita ---
+            try:
+                changed_sections = set(check_config_changes(AppConfig.model_validate(toml_doc.unwrap()), config))
+            except ValidationError:
+                # Arquivo atual inválido: todas as seções são reescritas
+                changed_sections = set(AppConfig.model_fields)
+            if not changed_sections:
+                logger.info(f"Configuração em {self.config_path} já está atualizada. Nada a salvar.")
+                return
+
+            # Itera através das seções alteradas do AppConfig
             config_data = config.model_dump(mode='python', exclude_none=True)
             
             for section_name, section_data in config_data.items():
+                if section_name not in changed_sections:
+                    continue
+
                 if not isinstance(section_data, dict):
                     logger.warning(f"Esperava um dict para a seção '{section_name}', mas encontrei {type(section_data)}. Pulando atualização para esta seção.")
                     continue
 
 
                 if section_name not in toml_doc:
-                    logger.debug(f"Criando nova tabela para a seção '{section_name}' no documento TOML.")
+                    logger.debug("Criando nova tabela para a seção no documento TOML.", section=section_name)
                     toml_doc[section_name] = tomlkit.table()
                 elif not isinstance(toml_doc[section_name], Table):
                      logger.warning(f"Item existente para a seção '{section_name}' não é uma tabela TOML ({type(toml_doc[section_name])}). Substituindo por uma tabela.")
@@ -161,16 +192,18 @@ class ConfigManager:
                 processed_keys_in_section = set()
                 for key, new_value in section_data.items():
                     processed_keys_in_section.add(key)
-                    existing_item = toml_section_table.get(key)
+                    # Container.item retorna sempre o Item do tomlkit (Table.get devolve bools como bool puro, sem trivia)
+                    existing_item = toml_section_table.value.item(key) if key in toml_section_table else None
                     
                     update_needed = True
                     if isinstance(existing_item, Item) and not isinstance(existing_item, Table):
-                         if type(existing_item.value) == type(new_value) and existing_item.value == new_value:
+                         existing_value = existing_item.unwrap()
+                         if type(existing_value) is type(new_value) and existing_value == new_value:
                              update_needed = False # Value and type same, skip update
-                             logger.debug(f"Valor para '{section_name}.{key}' não alterado ('{new_value}'). Pulando.")
+                             logger.debug("Valor não alterado. Pulando.", section=section_name, key=key)
                     
                     if update_needed:
-                        logger.debug(f"Atualizando valor para '{section_name}.{key}' para '{new_value}'.")
+                        logger.debug("Atualizando valor.", section=section_name, key=key, new_value=new_value)
                         try:
                             new_item = tomlkit.item(new_value)
                             if isinstance(existing_item, Item):
@@ -186,14 +219,25 @@ class ConfigManager:
                 
                 keys_to_remove = set(toml_section_table.keys()) - processed_keys_in_section
                 if keys_to_remove:
-                    logger.debug(f"Removendo chaves da seção TOML '{section_name}' que não estão nos dados Pydantic: {keys_to_remove}")
+                    logger.debug("Removendo chaves da seção TOML que não estão nos dados Pydantic.", section=section_name, keys=sorted(keys_to_remove))
                     for key_to_remove in keys_to_remove:
                         del toml_section_table[key_to_remove]
             
+            # --- Escreve em um arquivo temporário; o config.toml só é substituído com o conteúdo completo ---
+            tmp_path = self.config_path.with_name(self.config_path.name + ".tmp")
             logger.info(f"Salvando configuração em: {self.config_path} usando tomlkit (abordagem seção por seção)")
-            with open(self.config_path, "wt", encoding="utf-8") as f:
-                tomlkit.dump(toml_doc, f)
+            try:
+                with open(tmp_path, "wt", encoding="utf-8") as f:
+                    tomlkit.dump(toml_doc, f)
+                shutil.copymode(self.config_path, tmp_path)
+            except Exception:
+                tmp_path.unlink(missing_ok=True)
+                raise
+
+            # --- Backup Logic --- 
+            self._backup_current_config()
 
+            os.replace(tmp_path, self.config_path)
             logger.info("Configuração salva com sucesso.")
 
         except (IOError, tomlkit.exceptions.TOMLKitError) as e:
@@ -229,8 +273,9 @@ class ConfigManager:
         if section_names is None:
             section_names = list(_section_name_to_model.keys())
 
-        # Create a single copy before the loop to accumulate resets
-        config_to_update = config.model_copy(deep=True)
+        # Cópia rasa para acumular os resets: o setattr abaixo só troca a referência da seção na cópia,
+        # então as seções não resetadas podem ser compartilhadas com o config original (que não é alterado)
+        config_to_update = config.model_copy()
 
         for section_name in section_names:
             if section_name not in _section_name_to_model:
@@ -240,9 +285,8 @@ class ConfigManager:
 
             try:
                 logger.info(f"Resetando a seção '{section_name}' da configuração para os padrões.")
-                ModelClass = _section_name_to_model[section_name]
-                # Cria uma instância com valores padrão para essa seção
-                default_section_instance = ModelClass()
+                # Copia a instância padrão pré-construída dessa seção (os campos são valores imutáveis)
+                default_section_instance = _section_default(section_name).model_copy()
                 # Atualiza o objeto de configuração cumulativamente
                 setattr(config_to_update, section_name, default_section_instance)
                 
@@ -268,6 +312,27 @@ class ConfigManager:
             logger.error(msg, exc_info=True)
             raise ConfigurationError(msg) from e
 
+    def _backup_current_config(self) -> None:
+        """
+        Guarda o arquivo de configuração atual como backup antes de ele ser substituído.
+
+        O backup é um hard link para o arquivo atual (sem cópia de dados): como o save troca o
+        config.toml por um arquivo novo via os.replace, o conteúdo antigo permanece no backup.
+        Em sistemas de arquivos sem suporte a hard links, faz uma cópia.
+        """
+        backup_path = self.get_backup_config_path()
+        link_tmp_path = backup_path.with_name(backup_path.name + ".tmp")
+        try:
+            try:
+                link_tmp_path.unlink(missing_ok=True)
+                os.link(self.config_path, link_tmp_path)
+                os.replace(link_tmp_path, backup_path)
+            except OSError:
+                shutil.copy2(self.config_path, backup_path)
+            logger.info(f"Backup do arquivo de configuração criado em: {backup_path}")
+        except Exception as backup_e:
+            logger.warning(f"Falha ao criar backup do arquivo de configuração: {backup_e}")
+
     def get_default_config_path(self) -> Path:
         """Retorna o caminho para o arquivo de configuração gerenciado por esta instância."""
         return self.config_path
@@ -292,7 +357,8 @@ class ConfigManager:
             return False
 
         try:
-            shutil.copy2(backup_path, config_path_to_restore)
+            # copyfile (e não copy2): o arquivo restaurado recebe um mtime novo, invalidando o cache de configuração da GUI
+            shutil.copyfile(backup_path, config_path_to_restore)
             logger.info(f"Configuração restaurada com sucesso de {backup_path} para {config_path_to_restore}.")
             return True
         except Exception as e:
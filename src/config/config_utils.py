@@ -1,14 +1,11 @@
 from .models import AppConfig
 
 def check_config_changes(current_config: AppConfig, new_config: AppConfig):
-    update_fields = []
-        
-    # Iterate through field names
-    for field_name in new_config.model_fields.keys():
-        # Use getattr for safe attribute access
-        current_value = getattr(current_config, field_name)
-        new_value = getattr(new_config, field_name)
-        if current_value != new_value:
-            update_fields.append(field_name) # Append the name
-
-    return update_fields
\ No newline at end of file
+    """Retorna os nomes das seções do AppConfig cujo valor difere entre as duas configurações."""
+    # O Pydantic guarda os valores validados em __dict__; ler direto dele evita getattr por campo
+    current_sections = current_config.__dict__
+    return [
+        field_name
+        for field_name, new_value in new_config.__dict__.items()
+        if current_sections.get(field_name) != new_value
+    ]
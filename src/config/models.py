@@ -1,11 +1,21 @@
 from pydantic import BaseModel, Field, PositiveInt, conint, confloat, ConfigDict
 from typing import Literal, Optional, Dict, Any
 
-class SystemConfig(BaseModel):
+class _ConfigModel(BaseModel):
+    """Base dos modelos de configuração."""
+    model_config = ConfigDict(
+        # Adia a construção do schema de validação até o primeiro uso do modelo
+        defer_build=True,
+        # Opcional: Se desejar permitir campos extras no TOML
+        # que não estão definidos nos modelos (útil durante o desenvolvimento)
+        # extra = 'ignore'
+    )
+
+class SystemConfig(_ConfigModel):
     storage_base_path: str = "storage/domains"
     control_db_filename: str = "control.db"
 
-class IngestionConfig(BaseModel):
+class IngestionConfig(_ConfigModel):
     chunking_strategy: Literal["recursive", "semantic-cluster"] = "semantic-cluster"
     chunk_size: PositiveInt = 1000
     chunk_overlap: conint(ge=0) = 200 # type: ignore
@@ -14,7 +24,7 @@ class IngestionConfig(BaseModel):
     def chunking_strategy_options(self):
         return self.model_fields['chunking_strategy'].annotation.__args__
 
-class EmbeddingConfig(BaseModel):
+class EmbeddingConfig(_ConfigModel):
     model_name: Literal[
         "sentence-transformers/all-MiniLM-L6-v2", 
         "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2", 
@@ -35,11 +45,11 @@ class EmbeddingConfig(BaseModel):
     def device_options(self):
         return self.model_fields['device'].annotation.__args__
     
-class ClusteringConfig(BaseModel):
+class ClusteringConfig(_ConfigModel):
     distance_threshold: float = 0.85
     max_words: int = 250
 
-class VectorStoreConfig(BaseModel):
+class VectorStoreConfig(_ConfigModel):
     index_type: Literal["IndexFlatL2"] = "IndexFlatL2" # IndexFlatL2 possui um IndexIDMap wrapper em nosso sistema
     index_params: Optional[Dict[str, Any]] = None
     
@@ -47,11 +57,11 @@ class VectorStoreConfig(BaseModel):
     def vector_store_options(self):
         return self.model_fields['index_type'].annotation.__args__
         
-class QueryConfig(BaseModel):
+class QueryConfig(_ConfigModel):
     retrieval_k: PositiveInt = 5
     # rerank_strategy: Literal["none"] = "none" # Adicionar depois
 
-class LLMConfig(BaseModel):
+class LLMConfig(_ConfigModel):
     model_repo_id: str = "mistralai/Mistral-7B-Instruct-v0.3"
     max_new_tokens: PositiveInt = 1000
     temperature: confloat(ge=0.0, le=2.0) = 0.7 # type: ignore
@@ -67,13 +77,13 @@ Forneça a resposta *apenas* com base no contexto fornecido. Não adicione infor
 """
 )
 
-class TextNormalizerConfig(BaseModel):
+class TextNormalizerConfig(_ConfigModel):
     """Configuration for TextNormalizer steps."""
     use_unicode_normalization: bool = True
     use_lowercase: bool = True
     use_remove_extra_whitespace: bool = True
 
-class AppConfig(BaseModel):
+class AppConfig(_ConfigModel):
     system: SystemConfig = Field(default_factory=SystemConfig)
     ingestion: IngestionConfig = Field(default_factory=IngestionConfig)
     embedding: EmbeddingConfig = Field(default_factory=EmbeddingConfig)
@@ -82,9 +92,3 @@ class AppConfig(BaseModel):
     llm: LLMConfig = Field(default_factory=LLMConfig)
     text_normalizer: TextNormalizerConfig = Field(default_factory=TextNormalizerConfig)
     clustering: ClusteringConfig = Field(default_factory=ClusteringConfig)
-    model_config = ConfigDict(
-        # Opcional: Se desejar permitir campos extras no TOML
-        # que não estão definidos nos modelos (útil durante o desenvolvimento)
-        # extra = 'ignore'
-        # Adicione outras configurações da classe Config antiga (pydantic) aqui
-    ) 
\ No newline at end of file
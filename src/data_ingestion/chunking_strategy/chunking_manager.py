@@ -1,3 +1,4 @@
+import logging
 from typing import List, Dict, Optional
 
 from src.models import Chunk, DocumentFile
@@ -23,8 +24,9 @@ class ChunkingManager:
             log_domain (str): Domínio para o logger.
         """
         self.logger = get_logger(__name__, log_domain=log_domain)
-        self.config = config.model_copy(deep=True)
-        self.logger.info("Inicializando o TextChunker.", config_data=config.model_dump())
+        self.config = config.model_copy()
+        if self.logger.is_enabled_for(logging.INFO):
+            self.logger.info("Inicializando o TextChunker.", config_data=config.model_dump())
         self.chunker = self._create_chunker(self.config)
 
     def update_config(self, new_config: AppConfig) -> None:
@@ -46,7 +48,7 @@ class ChunkingManager:
             self.chunker.update_config(new_config)
             self.logger.info(f"Parametros de configuração de chunking alterados")
 
-        self.config = new_config.model_copy(deep=True)
+        self.config = new_config.model_copy()
         self.logger.info("Configuracoes do TextChunker atualizadas com sucesso")
 
 
@@ -1,20 +1,56 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Optional
+
+import numpy as np
 
 from src.models import Chunk, DocumentFile
 from src.config.models import AppConfig
 from src.utils.logger import get_logger
+from src.utils.model_cache import get_sentence_transformer
 from sentence_transformers import SentenceTransformer
 from keybert import KeyBERT
+from sklearn.feature_extraction.text import CountVectorizer
+
+# Stop words em português desconsideradas na extração de keywords - palavras comuns como "de", "o", "nas", etc.
+# O CountVectorizer do scikit-learn só oferece uma lista embutida para o inglês.
+PORTUGUESE_STOP_WORDS = frozenset("""
+    a à ao aos aquela aquelas aquele aqueles aquilo as às até com como da das de dela delas dele deles
+    depois do dos e é ela elas ele eles em entre era eram essa essas esse esses esta está estão estas
+    estava estavam este estes eu foi foram há isso isto já lhe lhes mais mas me mesmo meu meus minha
+    minhas muito na nas nem no nos nós nossa nossas nosso nossos num numa o os ou para pela pelas pelo
+    pelos por qual quando que quem se seja sejam sem ser será seu seus só sua suas também te tem têm
+    ter teu teus tinha tinham tu tua tuas um uma umas uns você vocês vos
+""".split())
+
+# Número mínimo de palavras para que um chunk tenha keywords extraídas
+MIN_WORDS_FOR_KEYWORDS = 6
 
 class ChunkingStrategy(ABC):
     def __init__(self, config: AppConfig, log_domain: str):
-        self.config = config.model_copy(deep=True)
+        self.config = config.model_copy()
         self.logger = get_logger(__name__, log_domain=log_domain)
-        self.embedding_model = SentenceTransformer(self.config.embedding.model_name)
-        self.keybert_model = KeyBERT(model=self.embedding_model)
+        # Os modelos são carregados sob demanda, no primeiro acesso (ver embedding_model e keybert_model)
+        self._embedding_model = None
+        self._keybert_model = None
+        # Vetorizador de candidatas construído uma única vez e reutilizado em todas as extrações
+        self._keyword_vectorizer = CountVectorizer(ngram_range=(1, 2), stop_words=list(PORTUGUESE_STOP_WORDS))
         self.logger.debug(f"Inicializando a estratégia de chunking: {self.__class__.__name__}")
         
+    @property
+    def embedding_model(self) -> SentenceTransformer:
+        """Modelo SentenceTransformer, carregado no primeiro acesso."""
+        if self._embedding_model is None:
+            self.logger.info(f"Obtendo o modelo SentenceTransformer: {self.config.embedding.model_name}", device=self.config.embedding.device)
+            self._embedding_model = get_sentence_transformer(self.config.embedding.model_name, self.config.embedding.device)
+        return self._embedding_model
+
+    @property
+    def keybert_model(self) -> KeyBERT:
+        """Modelo KeyBERT sobre o embedding_model, criado no primeiro acesso."""
+        if self._keybert_model is None:
+            self._keybert_model = KeyBERT(model=self.embedding_model)
+        return self._keybert_model
+
     @abstractmethod
     def create_chunks(self, file: DocumentFile) -> List[Chunk]:
         pass
@@ -34,48 +70,57 @@ class ChunkingStrategy(ABC):
             self.splitter._chunk_size, self.splitter._chunk_overlap = new_config.ingestion.chunk_size, new_config.ingestion.chunk_overlap
             self.logger.info(f"Parametros de chunking do {self.__class__.__name__} alterados. chunk_size: {self.splitter._chunk_size}, chunk_overlap: {self.splitter._chunk_overlap}")
 
-        if new_config.embedding.model_name != self.config.embedding.model_name:
-            self.embedding_model = SentenceTransformer(new_config.embedding.model_name)
-            self.keybert_model = KeyBERT(model=self.embedding_model)
-            self.logger.info(f"Modelo SentenceTransformer do {self.__class__.__name__} alterado para: {new_config.embedding.model_name}")
-
-        if new_config.embedding.device != self.config.embedding.device:
-            self.embedding_model.to(new_config.embedding.device)
-            self.logger.info(f"Dispositivo de embedding do {self.__class__.__name__} alterado para: {new_config.embedding.device}")
+        if new_config.embedding.model_name != self.config.embedding.model_name or new_config.embedding.device != self.config.embedding.device:
+            # Descarta as referências aos modelos; o modelo do novo nome/dispositivo é obtido do cache no próximo acesso.
+            # O modelo é compartilhado via get_sentence_transformer, então não é movido com .to()
+            self._embedding_model = None
+            self._keybert_model = None
+            self.logger.info(f"Modelo SentenceTransformer do {self.__class__.__name__} alterado para: {new_config.embedding.model_name} ({new_config.embedding.device})")
 
-        self.config = new_config.model_copy(deep=True)
+        self.config = new_config.model_copy()
         self.logger.info(f"Configuracoes do {self.__class__.__name__} atualizadas com sucesso")
 
-    def _generate_keywords(self, big_chunks: List[str]) -> List[List[str]]:
+    def _generate_keywords(self, big_chunks: List[str], doc_embeddings: Optional[np.ndarray] = None) -> List[List[str]]:
         """
         Gera keywords para cada chunk usando KeyBERT.
         
         Args:
             big_chunks (List[str]): Lista de chunks grandes para gerar keywords
+            doc_embeddings (Optional[np.ndarray]): Embeddings já calculados dos chunks, um por linha; 
+                quando fornecidos, o KeyBERT não recalcula os embeddings dos documentos
             
         Returns:
             List[List[str]]: Lista de listas de keywords para cada chunk
         """
         self.logger.info("Passo 9: Gerando keywords para cada chunk...")
-        keywords = []
+        keywords: List[List[str]] = [[] for _ in big_chunks]
+        # Chunks muito curtos ficam sem keywords e não passam pelo modelo
+        indexed_chunks = [(i, chunk) for i, chunk in enumerate(big_chunks) if len(chunk.split()) >= MIN_WORDS_FOR_KEYWORDS]
+        if not indexed_chunks:
+            return keywords
+        indices, texts = zip(*indexed_chunks)
         try:
-            for chunk in big_chunks:
-                # Extrai keywords usando KeyBERT
-                chunk_keywords = self.keybert_model.extract_keywords(
-                    chunk, 
-                    keyphrase_ngram_range=(1, 2), 
-                    stop_words='portuguese',  # Usando stop words em português - Desconsidera palavras comuns como "de", "o", "nas", etc.
-                    top_n=3,
-                    diversity=0.5,
-                    use_maxsum=True,
-                    nr_candidates=20
-                )
-                # Extrai apenas as keywords das tuplas (keyword, score)
-                keywords.append([kw[0] for kw in chunk_keywords])
+            # Extrai keywords de todos os chunks em uma única chamada ao KeyBERT,
+            # permitindo que os embeddings dos documentos sejam gerados em lote
+            results = self.keybert_model.extract_keywords(
+                list(texts),
+                doc_embeddings=doc_embeddings[list(indices)] if doc_embeddings is not None else None,
+                vectorizer=self._keyword_vectorizer,
+                top_n=3,
+                diversity=0.5,
+                use_maxsum=True,
+                nr_candidates=20
+            )
+            # Com um único documento, o KeyBERT retorna uma lista simples de tuplas
+            if len(texts) == 1:
+                results = [results]
+            # Extrai apenas as keywords das tuplas (keyword, score)
+            for i, chunk_keywords in zip(indices, results):
+                keywords[i] = [kw[0] for kw in chunk_keywords]
             
-            self.logger.info(f"Keywords geradas para {len(keywords)} chunks")
+            self.logger.info(f"Keywords geradas para {len(texts)} de {len(big_chunks)} chunks")
             return keywords
         except Exception as e:
             self.logger.error(f"Erro ao gerar keywords: {str(e)}")
             # Retorna lista vazia de keywords em caso de erro
-            return [[] for _ in big_chunks]
\ No newline at end of file
+            return [[] for _ in big_chunks]
@@ -1,3 +1,4 @@
+import logging
 from typing import List, Optional, Dict
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
@@ -25,7 +26,8 @@ class RecursiveStrategy(ChunkingStrategy):
         """
         super().__init__(config, log_domain)
 
-        self.logger.info("Inicializando o RecursiveStrategy.", config_data=config.model_dump())
+        if self.logger.is_enabled_for(logging.INFO):
+            self.logger.info("Inicializando o RecursiveStrategy.", config_data=config.model_dump())
         self.splitter = RecursiveCharacterTextSplitter(
                         chunk_size=self.config.ingestion.chunk_size, 
                         chunk_overlap=self.config.ingestion.chunk_overlap,
@@ -83,11 +85,14 @@ class RecursiveStrategy(ChunkingStrategy):
         Returns:
             List[Chunk]: Lista de objetos Chunk criados.
         """
-        document_chunks: List[Chunk] = []
+        # Conteúdos e páginas dos chunks em listas paralelas; os objetos Chunk são criados só ao final
+        contents: List[str] = []
+        page_numbers: List[Optional[int]] = []
         page_counter = 0
-        metadata = {"document_id": file.id,
-                    "page_number": -1
-                    }
+        # Metadados base repassados ao splitter, reutilizados entre as páginas (o splitter copia o dict para cada Document)
+        base_metadata = {"document_id": file.id,
+                         "page_number": -1
+                         }
 
         self.logger.info(f"Iniciando chunking recursivo para o documento: {file.id} ({file.name}) com {len(file.pages)} páginas.")
         try:
@@ -100,39 +105,19 @@ class RecursiveStrategy(ChunkingStrategy):
                     self.logger.warning(f"Página {page_counter} do documento {file.id} ({file.name}) está vazia. Pulando página.")
                     continue
 
-                metadata["page_number"] = page.metadata.get("page")
+                page_number = page.metadata.get("page")
+                base_metadata["page_number"] = page_number
                 
                 try:
-                    page_docs = self._chunk_text(page.page_content, metadata)
+                    page_docs = self._chunk_text(page.page_content, base_metadata)
 
                     if not page_docs:
                         self.logger.warning(f"Nenhum Chunk (Langchain Document) gerado por _chunk_text para a página {page_counter} do arquivo {file.name}. Pulando página.")
                         continue
 
-
-
-                    page_chunks: List[Chunk] = []
-                    for chunk_index, doc in enumerate(page_docs):
-                        doc_metadata = doc.metadata if hasattr(doc, 'metadata') else metadata
-                        
-                        start_index = doc_metadata.get("start_index", -1)
-                        if start_index == -1:
-                            self.logger.warning(f"start_index nao encontrado nos metadados do chunk {chunk_index}. Usando -1.")
-
-                        metadata = {"page_list": [doc_metadata.get("page_number", -1)]}
-                        chunk = Chunk(
-                            document_id=doc_metadata.get("document_id", -1),
-                            metadata=metadata,
-                            content=doc.page_content,
-                        )
-                        page_chunks.append(chunk)
-
-                    if not page_chunks:
-                        self.logger.warning(f"Nenhum objeto Chunk criado para a página {page_counter} do arquivo {file.name} (após conversão). Pulando página.")
-                        continue
-
-                    self.logger.info(f"Criados {len(page_chunks)} objetos Chunk recursivos para a página {page_counter} do arquivo {file.name}.")
-                    document_chunks.extend(page_chunks)
+                    contents.extend(doc.page_content for doc in page_docs)
+                    page_numbers.extend([page_number] * len(page_docs))
+                    self.logger.info(f"Criados {len(page_docs)} chunks recursivos para a página {page_counter} do arquivo {file.name}.")
 
                 except Exception as e:
                     self.logger.error(f"Erro ao processar chunks para a página {page_counter} do arquivo {file.id} ({file.name}): {e}", exc_info=True)
@@ -142,13 +127,19 @@ class RecursiveStrategy(ChunkingStrategy):
             self.logger.error(f"Erro ao criar objetos Chunk para o arquivo {file.name}: {e}", exc_info=True)
             raise e
             
-        self.logger.info(f"Chunking recursivo concluído para o arquivo {file.id}. Total de chunks criados: {len(document_chunks)}.")
+        self.logger.info(f"Chunking recursivo concluído para o arquivo {file.id}. Total de chunks criados: {len(contents)}.")
         
-        # Gera keywords para cada chunk
-        keywords = self._generate_keywords(document_chunks)
+        # Gera keywords para todos os chunks em lote, a partir dos conteúdos
+        keywords = self._generate_keywords(contents)
         
-        for i, chunk in enumerate(document_chunks):
-            chunk.metadata["indices_list"] = [i]
-            chunk.metadata["keywords"] = keywords[i]
+        # Os campos vêm do próprio splitter; model_construct dispensa a revalidação de cada Chunk
+        document_chunks: List[Chunk] = [
+            Chunk.model_construct(
+                document_id=file.id,
+                metadata={"page_list": [page_number], "indices_list": [i], "keywords": chunk_keywords},
+                content=content,
+            )
+            for i, (content, page_number, chunk_keywords) in enumerate(zip(contents, page_numbers, keywords))
+        ]
 
         return document_chunks
\ No newline at end of file
@@ -1,6 +1,6 @@
 import numpy as np
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from sklearn.cluster import AgglomerativeClustering
@@ -24,9 +24,7 @@ class SemanticClusterStrategy(ChunkingStrategy):
         """
         super().__init__(config, log_domain)
 
-        self.logger.info("Carregando o modelo SentenceTransformer: sentence-transformers/LaBSE")
         self.splitter = RecursiveCharacterTextSplitter(chunk_size=self.config.ingestion.chunk_size, chunk_overlap=self.config.ingestion.chunk_overlap)
-        self.logger.info("Modelo SentenceTransformer carregado com sucesso.")
 
     def _chunk_text_small(self, pages: List[Document]) -> List[Document]:
         """
@@ -39,20 +37,18 @@ class SemanticClusterStrategy(ChunkingStrategy):
         Returns:
             List[Document]: Lista de chunks pequenos com metadados de página
         """
-        small_chunks: List[Document] = []
-
         self.logger.debug("Passo-1: Criando chunks pequenos para processamento intermediário")
+        texts: List[str] = []
+        metadatas: List[Dict] = []
         for page in pages:
             if not page.page_content:
                 self.logger.warning(f"Página vazia encontrada. Pulando processamento da página: {page.metadata.get('page', 'unknown')}")
                 continue
+            texts.append(page.page_content)
+            metadatas.append({"page_number": page.metadata.get('page')})
 
-            # Cria chunks a partir do conteúdo da página
-            page_chunks = self.splitter.create_documents(
-                [page.page_content], 
-                [{"page_number": page.metadata.get('page')}]
-            )
-            small_chunks.extend(page_chunks)
+        # Cria os chunks de todas as páginas em uma única chamada ao splitter
+        small_chunks: List[Document] = self.splitter.create_documents(texts, metadatas)
 
         # Adiciona o index_in_doc a cada chunk
         for i, chunk in enumerate(small_chunks):
@@ -72,12 +68,10 @@ class SemanticClusterStrategy(ChunkingStrategy):
             List[str]: Lista de conteúdos enriquecidos para clustering
         """
         self.logger.debug("Passo 2: Enriquecendo chunks pequenos com metadados: page_number e index_in_doc")
-        enriched_contents : List[str] = []
-
-        for chunk in chunks:
-            prepend_string = f"[página: {chunk.metadata['page_number']}, índice: {chunk.metadata['index_in_doc']}]"
-            enriched_content = f"{prepend_string} {chunk.page_content}"
-            enriched_contents.append(enriched_content)
+        enriched_contents: List[str] = [
+            f"[página: {chunk.metadata['page_number']}, índice: {chunk.metadata['index_in_doc']}] {chunk.page_content}"
+            for chunk in chunks
+        ]
 
         self.logger.info(f"Total de {len(enriched_contents)} chunks enriquecidos com metadados")
         return enriched_contents
@@ -96,10 +90,11 @@ class SemanticClusterStrategy(ChunkingStrategy):
     def _combine_embeddings(self, text_embeddings: np.ndarray, metadata_embeddings: np.ndarray) -> np.ndarray:
         """
         Combina os embeddings de texto e metadados usando pesos.
+        O array de metadados é reaproveitado como buffer e tem seu conteúdo alterado.
         
         Args:
             text_embeddings: Array numpy contendo os embeddings do texto
-            metadata_embeddings: Array numpy contendo os embeddings dos metadados
+            metadata_embeddings: Array numpy contendo os embeddings dos metadados (sobrescrito)
             
         Returns:
             Array numpy com os embeddings combinados
@@ -108,18 +103,24 @@ class SemanticClusterStrategy(ChunkingStrategy):
         # Define o peso para os metadados (ajuste conforme necessário)
         metadata_weight = self.config.embedding.weight
         
-        # Combina os embeddings usando pesos
-        combined_embeddings = (
-            (1 - metadata_weight) * text_embeddings + 
-            metadata_weight * metadata_embeddings
-        )
+        # Combina os embeddings usando pesos: (1 - w) * texto + w * metadados,
+        # com uma única alocação e as demais operações feitas in-place
+        combined_embeddings = np.multiply(text_embeddings, 1 - metadata_weight)
+        metadata_embeddings *= metadata_weight
+        combined_embeddings += metadata_embeddings
         
         self.logger.info(f"Combined_embeddings shape: {combined_embeddings.shape}")
         return combined_embeddings
 
-    def _cluster_small_chunks(self, combined_embeddings: np.ndarray, enriched_chunks: List[str]) -> Dict:
+    def _cluster_small_chunks(self, combined_embeddings: np.ndarray) -> Dict[int, List[int]]:
         """
         Agrupa os chunks em clusters
+
+        Args:
+            combined_embeddings (np.ndarray): Embeddings combinados dos chunks pequenos
+
+        Returns:
+            Dict[int, List[int]]: Índices dos chunks pequenos de cada cluster, na ordem do documento
         """
         self.logger.info("Passo 6: Iniciando o clustering hierárquico", distance_threshold=self.config.clustering.distance_threshold)
         clustering = AgglomerativeClustering(n_clusters=None, distance_threshold=self.config.clustering.distance_threshold)
@@ -128,47 +129,54 @@ class SemanticClusterStrategy(ChunkingStrategy):
 
         self.logger.info("Passo 7: Agrupando chunks pequenos em clusters")
         clusters = {}
-        for label, chunk in zip(labels, enriched_chunks):
-            clusters.setdefault(label, []).append(chunk)
+        for i, label in enumerate(labels):
+            clusters.setdefault(label, []).append(i)
         self.logger.info(f"Chunks pequenos agrupados em {len(clusters)} clusters.")
         
         return clusters
 
-    def _chunk_clusters(self, clusters: Dict) -> List[str]:
+    def _chunk_clusters(self, clusters: Dict[int, List[int]], enriched_chunks: List[str]) -> Tuple[List[str], List[List[int]]]:
         """
         Cria chunks grandes a partir dos clusters
         
         Args:
-            clusters (Dict): Dicionário de clusters
+            clusters (Dict[int, List[int]]): Índices dos chunks pequenos de cada cluster
+            enriched_chunks (List[str]): Conteúdos enriquecidos dos chunks pequenos
             
         Returns:
-            List[str]: Lista de chunks grandes
+            Tuple[List[str], List[List[int]]]: Lista de chunks grandes e, para cada um, 
+                os índices dos chunks pequenos que o compõem
         """
         self.logger.info("Passo 8: Criando chunks grandes com tamanho otimizado a partir dos clusters")
         big_chunks = []
+        big_chunk_indices = []
         max_words = self.config.clustering.max_words
-        for cluster_small_chunks in clusters.values():
-            chunk = " ".join(cluster_small_chunks)
-            words = chunk.split()
-            if len(words) > max_words:
-                temp_chunk = ""
-                temp_word_count = 0
-                for small_chunk in cluster_small_chunks:
-                    small_chunk_word_count = len(small_chunk.split())
-                    if temp_word_count + small_chunk_word_count <= max_words:
-                        temp_chunk += " " + small_chunk
-                        temp_word_count += small_chunk_word_count
-                    else:
-                        big_chunks.append(temp_chunk.strip())
-                        temp_chunk = small_chunk
-                        temp_word_count = small_chunk_word_count
-                if temp_chunk:
-                    big_chunks.append(temp_chunk.strip())
-            else:
-                big_chunks.append(chunk.strip())
+        for cluster_indices in clusters.values():
+            cluster_small_chunks = [enriched_chunks[i] for i in cluster_indices]
+            # Conta as palavras de cada chunk pequeno uma única vez
+            word_counts = [len(small_chunk.split()) for small_chunk in cluster_small_chunks]
+            if sum(word_counts) <= max_words:
+                big_chunks.append(" ".join(cluster_small_chunks).strip())
+                big_chunk_indices.append(cluster_indices)
+                continue
+
+            # Agrupa chunks pequenos consecutivos até o limite de palavras e junta cada fatia de uma vez
+            start = 0
+            temp_word_count = 0
+            for i, small_chunk_word_count in enumerate(word_counts):
+                if temp_word_count + small_chunk_word_count <= max_words:
+                    temp_word_count += small_chunk_word_count
+                    continue
+                if i > start:
+                    big_chunks.append(" ".join(cluster_small_chunks[start:i]).strip())
+                    big_chunk_indices.append(cluster_indices[start:i])
+                start = i
+                temp_word_count = small_chunk_word_count
+            big_chunks.append(" ".join(cluster_small_chunks[start:]).strip())
+            big_chunk_indices.append(cluster_indices[start:])
 
         self.logger.info(f"Processo de chunking finalizado. {len(big_chunks)} chunks gerados.")
-        return big_chunks
+        return big_chunks, big_chunk_indices
 
     def _enrich_cluster_chunks(self, chunks: List[str], keywords: List[List[str]], file_name: str) -> List[str]:
         """
@@ -222,58 +230,59 @@ class SemanticClusterStrategy(ChunkingStrategy):
 
         # Cria chunks pequenos para processamento intermediário
         small_chunks = self._chunk_text_small(pages)
+        if not small_chunks:
+            # Todas as páginas estão vazias (ex: PDF escaneado, só com imagens)
+            self.logger.error("Nenhum texto encontrado nas páginas do arquivo.", file_name=file.name)
+            raise ValueError("Nenhum texto encontrado nas páginas do arquivo.")
 
         # Enriquecimento das sentenças com metadados
         enriched_small_chunks = self._enrich_small_chunks(small_chunks)
 
-        # Geração de embeddings textuais
-        self.logger.info("Passo 3: Gerando embeddings textuais para os chunks pequenos")
-        text_embeddings = self.embedding_model.encode(enriched_small_chunks, batch_size=self.config.embedding.batch_size)
-
-        # Preparação das strings dos metadados
-        metadata_strings = self._prepare_metadata_strings(small_chunks)
-        # Geração de embeddings de metadados
-        self.logger.info("Passo 4: Gerando embeddings para os metadados dos chunks pequenos")
-        metadata_embeddings = self.embedding_model.encode(metadata_strings, batch_size=self.config.embedding.batch_size)
-
-        # Combinação dos embeddings
+        total_words = sum(len(chunk.split()) for chunk in enriched_small_chunks)
+        if total_words <= self.config.clustering.max_words:
+            # O documento inteiro cabe em um único chunk grande: embeddings e clustering são dispensados
+            self.logger.info("Documento dentro do limite de palavras. Pulando embeddings e clustering.", total_words=total_words)
+            clusters = {0: list(range(len(enriched_small_chunks)))}
+            text_embeddings = None
+        else:
+            # Preparação das strings dos metadados
+            metadata_strings = self._prepare_metadata_strings(small_chunks)
+
+            # Geração dos embeddings textuais e de metadados em uma única chamada ao modelo
+            self.logger.info("Passos 3 e 4: Gerando embeddings textuais e de metadados para os chunks pequenos")
+            all_embeddings = self.embedding_model.encode(
+                enriched_small_chunks + metadata_strings,
+                batch_size=self.config.embedding.batch_size,
+                convert_to_numpy=True,
+            )
+            n_small_chunks = len(enriched_small_chunks)
+            text_embeddings, metadata_embeddings = all_embeddings[:n_small_chunks], all_embeddings[n_small_chunks:]
 
-        combined_embeddings = self._combine_embeddings(text_embeddings, metadata_embeddings)
+            # Combinação dos embeddings
+            combined_embeddings = self._combine_embeddings(text_embeddings, metadata_embeddings)
 
-        # Clusteriza os chunks pequenos
-        clusters = self._cluster_small_chunks(combined_embeddings, enriched_small_chunks)
+            # Clusteriza os chunks pequenos
+            clusters = self._cluster_small_chunks(combined_embeddings)
 
         # Forma chunks grandes a partir dos clusters
-        big_chunks = self._chunk_clusters(clusters)
-
-        # Gerando keywords para cada chunk
-        keywords = self._generate_keywords(big_chunks)
+        big_chunks, big_chunk_indices = self._chunk_clusters(clusters, enriched_small_chunks)
+
+        # Gerando keywords para cada chunk; o embedding de cada chunk grande é a média dos embeddings
+        # textuais dos chunks pequenos que o compõem, evitando uma nova passada do modelo pelo KeyBERT
+        big_chunk_embeddings = None
+        if text_embeddings is not None:
+            big_chunk_embeddings = np.stack([text_embeddings[small_chunk_indices].mean(axis=0) for small_chunk_indices in big_chunk_indices])
+        keywords = self._generate_keywords(big_chunks, doc_embeddings=big_chunk_embeddings)
         self.logger.info(f"Keywords: {keywords}")
 
         enriched_cluster_chunks = self._enrich_cluster_chunks(big_chunks, keywords, file.name)
 
         self.logger.info("Passo 11: Criando objetos Chunk finais")
         final_chunks = []
-        for chunk_keywords, chunk in zip(keywords, enriched_cluster_chunks):
-            page_list = []
-            index_list = []
-            # Extrai todas as páginas e índices de cada chunk
-            try:
-                # Encontra todas as seções de metadados no chunk
-                metadata_sections = chunk.split('[')
-                for section in metadata_sections:
-                    if 'página:' in section and 'índice:' in section:
-                        try:
-                            page_part = section.split('página:')[1].split(',')[0].strip()
-                            index_part = section.split('índice:')[1].split(']')[0].strip()
-                            page_list.append(int(page_part))
-                            index_list.append(int(index_part))
-                        except (IndexError, ValueError) as e:
-                            self.logger.warning(f"Falha ao parsear a seção de metadados: {section[:100]}... Error: {e}")
-                            continue
-            except Exception as e:
-                self.logger.error(f"Erro ao processar metadados do chunk: {e}")
-                continue
+        for chunk_keywords, chunk, small_chunk_indices in zip(keywords, enriched_cluster_chunks, big_chunk_indices):
+            # Páginas e índices vêm diretamente dos metadados dos chunks pequenos que compõem o chunk
+            page_list = [small_chunks[i].metadata["page_number"] for i in small_chunk_indices]
+            index_list = [small_chunks[i].metadata["index_in_doc"] for i in small_chunk_indices]
 
             chunk_obj = Chunk(
                 document_id=file.id,
@@ -35,7 +35,7 @@ class DataIngestionOrchestrator:
         self.embedding_generator = EmbeddingGenerator(config.embedding, log_domain=self.DEFAULT_LOG_DOMAIN)
         self.sqlite_manager = SQLiteManager(config.system, log_domain=self.DEFAULT_LOG_DOMAIN)
         self.faiss_manager = FaissManager(config, log_domain=self.DEFAULT_LOG_DOMAIN)
-        self.document_hashes: Dict[str, str] = {}
+        self.document_hashes = {}
 
     def update_config(self, new_config: AppConfig) -> None:
         """
@@ -70,6 +70,22 @@ class DataIngestionOrchestrator:
         self.config = new_config.model_copy(deep=True)
         self.logger.info("Configuracoes do DataIngestionOrchestrator atualizadas com sucesso")
 
+    @property
+    def document_hashes(self) -> Dict[str, str]:
+        """Hashes dos documentos ingeridos nesta sessão, por nome de arquivo."""
+        return self._document_hashes
+
+    @document_hashes.setter
+    def document_hashes(self, document_hashes: Dict[str, str]) -> None:
+        self._document_hashes = document_hashes
+        # Índice inverso (hash -> nome do arquivo) para as verificações de duplicata
+        self._hash_to_filename = {hash_value: filename for filename, hash_value in document_hashes.items()}
+
+    def _register_document_hash(self, filename: str, document_hash: str) -> None:
+        """Registra o hash de um documento ingerido, mantendo o índice inverso atualizado."""
+        self._document_hashes[filename] = document_hash
+        self._hash_to_filename[document_hash] = filename
+
     def _find_original_document(self, duplicate_hash: str, conn: sqlite3.Connection) -> DocumentFile:
         """
         Encontra o documento original do hash duplicado.
@@ -87,16 +103,16 @@ class DataIngestionOrchestrator:
         self.logger.info(f"Procurando o documento original com o hash: {duplicate_hash}")
         # Primeiro procura no dicionário de hashes
         try:
-            for filename, hash_value in self.document_hashes.items():
-                if hash_value == duplicate_hash:
-                    # Cria um DocumentFile com as informações básicas
-                    return DocumentFile(
-                        id=None,
-                        hash=hash_value,
-                        name=filename,
-                        path=os.path.join(os.path.dirname(filename), filename),
-                        total_pages=0
-                    )
+            filename = self._hash_to_filename.get(duplicate_hash)
+            if filename is not None:
+                # Cria um DocumentFile com as informações básicas
+                return DocumentFile(
+                    id=None,
+                    hash=duplicate_hash,
+                    name=filename,
+                    path=os.path.join(os.path.dirname(filename), filename),
+                    total_pages=0
+                )
             
         # Se não encontrou no dicionário, procura no banco de dados
             cursor = conn.execute("SELECT * FROM document_files WHERE hash = ?", (duplicate_hash,)) 
@@ -126,10 +142,9 @@ class DataIngestionOrchestrator:
         self.logger.debug(f"Verificando se o documento é duplicado: {document_hash}")    
         try:
             # Verifica se já existe um documento com o mesmo hash
-            for existing_hash in self.document_hashes.values():
-                if existing_hash == document_hash:
-                    self.logger.warning(f"Documento duplicado encontrado")
-                    return True
+            if document_hash in self._hash_to_filename:
+                self.logger.warning(f"Documento duplicado encontrado")
+                return True
             
             cursor = conn.execute("SELECT * FROM document_files WHERE hash = ?", (document_hash,))
             result = cursor.fetchone()
@@ -311,7 +326,7 @@ class DataIngestionOrchestrator:
                     file_metrics["file_hash"] = file.hash
 
                     # Adiciona o hash do documento ao dicionário de hashes
-                    self.document_hashes[file.name] = file.hash
+                    self._register_document_hash(file.name, file.hash)
 
                     # Insere o documento no banco de dados e recebe seu id
                     file.id = self.sqlite_manager.insert_document_file(file, conn)
@@ -1,14 +1,34 @@
 """Shared components for the PDF data ingestion and search system."""
 
-from .text_normalizer import TextNormalizer
-from .embedding_generator import EmbeddingGenerator
-from .faiss_manager import FaissManager
-from .sqlite_manager import SQLiteManager
-from .domain_manager import DomainManager
+import importlib
+
+# Os componentes são carregados sob demanda (PEP 562): importar um módulo leve como
+# src.utils.logger não deve carregar sentence-transformers, torch e faiss
+_lazy_components = {
+    'TextNormalizer': '.text_normalizer',
+    'EmbeddingGenerator': '.embedding_generator',
+    'FaissManager': '.faiss_manager',
+    'SQLiteManager': '.sqlite_manager',
+    'DomainManager': '.domain_manager',
+    'ChatHistoryManager': '.chat_history_manager',
+}
+
 __all__ = [
     'TextNormalizer',
     'EmbeddingGenerator',
     'FaissManager',
     'SQLiteManager',
-    'DomainManager'
-] 
\ No newline at end of file
+    'DomainManager',
+    'ChatHistoryManager'
+]
+
+def __getattr__(name: str):
+    """Importa o componente solicitado no primeiro acesso e o guarda no namespace do pacote."""
+    if name in _lazy_components:
+        component = getattr(importlib.import_module(_lazy_components[name], __name__), name)
+        globals()[name] = component
+        return component
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(__all__)
@@ -0,0 +1,132 @@
+import os
+import sqlite3
+
+from typing import List, Dict
+
+from src.utils.logger import get_logger
+from src.config.models import SystemConfig
+
+
+class ChatHistoryManager:
+    """
+    Gerenciador do histórico de chat da interface de consultas.
+
+    As mensagens são persistidas em um banco SQLite próprio (chat_history.db, no diretório base de armazenamento),
+    indexadas pelo id da sessão; a interface mantém em memória apenas as mensagens mais recentes.
+    O conteúdo é armazenado como texto simples. Cada nova mensagem aplica a retenção: são mantidas no máximo
+    MAX_MESSAGES_PER_SESSION mensagens por sessão, e mensagens com mais de RETENTION_DAYS dias são removidas.
+    """
+
+    SCHEMA_PATH: str = os.path.join("storage", "schemas", "chat_history_schema.sql")
+    DB_FILENAME: str = "chat_history.db"
+    MAX_MESSAGES_PER_SESSION: int = 500
+    RETENTION_DAYS: int = 30
+
+    def __init__(self, config: SystemConfig, log_domain: str = "utils"):
+        self.logger = get_logger(__name__, log_domain=log_domain)
+        self.logger.info("Inicializando o ChatHistoryManager")
+        self.db_path = os.path.join(config.storage_base_path, self.DB_FILENAME)
+        self._create_database()
+
+    def _create_database(self) -> None:
+        """
+        Cria o banco de dados do histórico de chat, se necessário, com journal em modo WAL.
+        """
+        try:
+            with open(self.SCHEMA_PATH, "r") as f:
+                schema = f.read()
+
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir and not os.path.exists(db_dir):
+                self.logger.info(f"Diretorio do banco de dados nao existe. Criando: {db_dir}")
+                os.makedirs(db_dir, exist_ok=True)
+
+            with sqlite3.connect(self.db_path) as conn:
+                conn.execute("PRAGMA journal_mode = WAL")
+                conn.executescript(schema)
+                conn.commit()
+
+        except FileNotFoundError as e:
+            self.logger.error(f"Erro: Schema nao encontrado em {self.SCHEMA_PATH}: {e}")
+            raise FileNotFoundError(f"Arquivo do schema nao encontrado em {self.SCHEMA_PATH}: {e}")
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao criar o banco de dados do historico de chat: {e}")
+            raise e
+
+    def get_connection(self) -> sqlite3.Connection:
+        """
+        Estabelece uma conexão com o banco de dados do histórico de chat.
+        """
+        return sqlite3.connect(self.db_path)
+
+    def append_message(self, session_id: str, role: str, content: str) -> None:
+        """
+        Adiciona uma mensagem ao final do histórico da sessão e aplica a retenção do histórico.
+
+        Args:
+            session_id: Id da sessão de chat.
+            role: Papel do autor da mensagem ("user" ou "assistant").
+            content: Conteúdo da mensagem.
+        """
+        self.logger.debug(f"Inserindo mensagem no historico de chat da sessao: {session_id}", role=role)
+        try:
+            with self.get_connection() as conn:
+                conn.execute(
+                    "INSERT INTO chat_history (session_id, role, content) VALUES (?, ?, ?)",
+                    (session_id, role, content)
+                )
+                # Mantém apenas as últimas MAX_MESSAGES_PER_SESSION mensagens da sessão
+                conn.execute(
+                    """DELETE FROM chat_history WHERE session_id = ? AND id <= (
+                           SELECT id FROM chat_history WHERE session_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?
+                       )""",
+                    (session_id, session_id, self.MAX_MESSAGES_PER_SESSION)
+                )
+                # Remove mensagens (de qualquer sessão) mais antigas que o período de retenção
+                conn.execute(
+                    "DELETE FROM chat_history WHERE created_at < datetime('now', ?)",
+                    (f"-{self.RETENTION_DAYS} days",)
+                )
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao inserir mensagem no historico de chat: {e}")
+            raise e
+
+    def get_recent_messages(self, session_id: str, limit: int) -> List[Dict[str, str]]:
+        """
+        Recupera as últimas mensagens do histórico da sessão.
+
+        Args:
+            session_id: Id da sessão de chat.
+            limit: Número máximo de mensagens a recuperar.
+
+        Returns:
+            List[Dict[str, str]]: Mensagens ({"role", "content"}) em ordem cronológica.
+        """
+        self.logger.debug(f"Recuperando as ultimas {limit} mensagens da sessao: {session_id}")
+        try:
+            with self.get_connection() as conn:
+                cursor = conn.execute(
+                    "SELECT role, content FROM chat_history WHERE session_id = ? ORDER BY id DESC LIMIT ?",
+                    (session_id, limit)
+                )
+                rows = cursor.fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao recuperar o historico de chat: {e}")
+            raise e
+
+        return [{"role": role, "content": content} for role, content in reversed(rows)]
+
+    def delete_session(self, session_id: str) -> None:
+        """
+        Remove todo o histórico de uma sessão.
+
+        Args:
+            session_id: Id da sessão de chat.
+        """
+        self.logger.info(f"Removendo o historico de chat da sessao: {session_id}")
+        try:
+            with self.get_connection() as conn:
+                conn.execute("DELETE FROM chat_history WHERE session_id = ?", (session_id,))
+        except sqlite3.Error as e:
+            self.logger.error(f"Erro ao remover o historico de chat: {e}")
+            raise e
@@ -29,7 +29,10 @@ class Logger:
         self.context: Dict[str, Any] = {}
         
     def _format_message(self, message: str, level: str, **kwargs) -> str:
-        """Formata a mensagem de log com contexto e campos adicionais."""
+        """Formata a mensagem de log com contexto e campos adicionais.
+
+        Só é chamado quando o nível está habilitado, já que a inspeção do stack e o json.dumps têm custo.
+        """
         # Obtém o nome da função chamada a partir do stack
         import inspect
         frame = inspect.currentframe()
@@ -65,8 +68,17 @@ class Logger:
         """Limpa todas as informações de contexto."""
         self.context.clear()
     
+    def is_enabled_for(self, level: int) -> bool:
+        """Indica se mensagens do nível informado serão registradas.
+
+        Útil para evitar montar campos caros (ex: model_dump) quando o nível está desabilitado.
+        """
+        return self.logger.isEnabledFor(level)
+    
     def info(self, message: str, **kwargs) -> None:
         """Registra uma mensagem de informação com contexto."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
         self.logger.info(
             self._format_message(message, "INFO", **kwargs),
             stacklevel=2
@@ -74,6 +86,8 @@ class Logger:
     
     def error(self, message: str, **kwargs) -> None:
         """Registra uma mensagem de erro com contexto."""
+        if not self.logger.isEnabledFor(logging.ERROR):
+            return
         self.logger.error(
             self._format_message(message, "ERROR", **kwargs),
             exc_info=True,
@@ -83,6 +97,8 @@ class Logger:
     
     def warning(self, message: str, **kwargs) -> None:
         """Registra uma mensagem de aviso com contexto."""
+        if not self.logger.isEnabledFor(logging.WARNING):
+            return
         self.logger.warning(
             self._format_message(message, "WARNING", **kwargs),
             stacklevel=2
@@ -90,6 +106,8 @@ class Logger:
     
     def debug(self, message: str, **kwargs) -> None:
         """Registra uma mensagem de debug com contexto."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
         self.logger.debug(
             self._format_message(message, "DEBUG", **kwargs),
             stacklevel=2
@@ -97,6 +115,8 @@ class Logger:
     
     def critical(self, message: str, **kwargs) -> None:
         """Registra uma mensagem crítica com contexto."""
+        if not self.logger.isEnabledFor(logging.CRITICAL):
+            return
         self.logger.critical(
             self._format_message(message, "CRITICAL", **kwargs),
             exc_info=True,
@@ -0,0 +1,26 @@
+"""
+Cache de modelos compartilhado pelo processo.
+
+Carregar um SentenceTransformer leva alguns segundos; as estratégias de chunking
+reaproveitam as instâncias já carregadas para o mesmo modelo e dispositivo.
+"""
+
+from functools import lru_cache
+
+from sentence_transformers import SentenceTransformer
+
+@lru_cache(maxsize=4)
+def get_sentence_transformer(model_name: str, device: str) -> SentenceTransformer:
+    """
+    Retorna o SentenceTransformer do modelo e dispositivo informados, carregando-o apenas na primeira chamada.
+
+    A instância é compartilhada: não a mova de dispositivo com .to(); peça o modelo para o novo dispositivo.
+
+    Args:
+        model_name (str): Nome do modelo SentenceTransformer.
+        device (str): Dispositivo onde o modelo será carregado ("cpu" ou "cuda").
+
+    Returns:
+        SentenceTransformer: O modelo carregado.
+    """
+    return SentenceTransformer(model_name, device=device)
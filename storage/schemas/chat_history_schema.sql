@@ -0,0 +1,11 @@
+CREATE TABLE IF NOT EXISTS chat_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_chat_history_session ON chat_history (session_id, id);
+
+CREATE INDEX IF NOT EXISTS idx_chat_history_created_at ON chat_history (created_at);
@@ -226,6 +226,40 @@ device = "cuda"
         assert 'device = "cpu"' in saved_content 
         assert 'batch_size = 64' in saved_content 
 
+    def test_save_config_skips_unchanged_config(self, manager: ConfigManager, mocker):
+        """Testa que salvar uma config igual à do arquivo não cria backup nem reescreve o arquivo."""
+        valid_dict = get_valid_config_dict()
+        manager.config_path.write_text(tomlkit.dumps(valid_dict), encoding="utf-8")
+        mock_dump = mocker.patch("tomlkit.dump")
+
+        manager.save_config(manager.load_config())
+
+        mock_dump.assert_not_called()
+        assert not manager.get_backup_config_path().exists()
+
+    def test_save_config_only_rewrites_changed_sections(self, manager: ConfigManager):
+        """Testa que apenas as seções alteradas são reescritas no arquivo."""
+        config_file = manager.config_path
+        initial_content = '''\
+[system]
+storage_base_path = "data/original_storage"
+control_db_filename = "control.db"
+chave_antiga = "mantida"
+
+[llm]
+temperature = 0.5
+'''
+        config_file.write_text(initial_content, encoding="utf-8")
+
+        loaded_config = manager.load_config()
+        loaded_config.llm.temperature = 0.9
+        manager.save_config(loaded_config)
+
+        saved_content = config_file.read_text(encoding="utf-8")
+        assert 'chave_antiga = "mantida"' in saved_content
+        assert "temperature = 0.9" in saved_content
+        assert manager.get_backup_config_path().read_text(encoding="utf-8") == initial_content
+
     def test_save_config_type_error(self, manager: ConfigManager):
         """Testa chamar save_config com um objeto que não é AppConfig."""
         not_an_appconfig = {"system": {"log_level": "INFO"}} 
@@ -239,7 +273,7 @@ device = "cuda"
         
         config_to_save = AppConfig(**get_valid_config_dict())
 
-        mock_dump = mocker.patch("src.config.config_manager.tomlkit.dump", side_effect=IOError("Disco cheio"))
+        mock_dump = mocker.patch("tomlkit.dump", side_effect=IOError("Disco cheio"))
         
         # O match espera o erro levantado durante a tentativa de escrita.
         with pytest.raises(ConfigurationError, match="Erro de I/O ou TOMLKit ao salvar"):
@@ -248,6 +282,42 @@ device = "cuda"
         # Verifica que o mock foi chamado
         mock_dump.assert_called_once()
 
+    def test_save_config_write_error_keeps_original_file(self, manager: ConfigManager, mocker):
+        """Testa que uma falha na escrita não altera o arquivo original nem o backup."""
+        valid_dict = get_valid_config_dict()
+        original_content = tomlkit.dumps(valid_dict)
+        manager.config_path.write_text(original_content, encoding="utf-8")
+        config_to_save = AppConfig(**valid_dict)
+        config_to_save.llm.temperature = 1.5
+
+        mocker.patch("tomlkit.dump", side_effect=IOError("Disco cheio"))
+        with pytest.raises(ConfigurationError):
+            manager.save_config(config_to_save)
+
+        assert manager.config_path.read_text(encoding="utf-8") == original_content
+        assert not manager.get_backup_config_path().exists()
+        assert list(manager.config_path.parent.glob("*.tmp")) == []
+
+    def test_save_config_updates_only_changed_keys(self, manager: ConfigManager, mocker):
+        """Testa que chaves inalteradas não são recriadas e que comentários de booleanos são mantidos."""
+        config_file = manager.config_path
+        config_file.write_text('''\
+[text_normalizer]
+use_unicode_normalization = true
+use_lowercase = true # Comentário bool
+use_remove_extra_whitespace = true
+''', encoding="utf-8")
+
+        loaded_config = manager.load_config()
+        loaded_config.text_normalizer.use_lowercase = False
+        item_spy = mocker.spy(tomlkit, "item")
+
+        manager.save_config(loaded_config)
+
+        saved_content = config_file.read_text(encoding="utf-8")
+        assert "use_lowercase = false # Comentário bool" in saved_content
+        assert item_spy.call_count == 1
+
     # --- Testes para reset_config ---
 
     def test_reset_config_section_success_and_preserves_comments(self, manager: ConfigManager):
@@ -289,6 +359,18 @@ temperature = 0.99 # Temp customizada
         expected_prompt_line = f'prompt_template = "{default_llm_config.prompt_template}"'.replace('\n', '\\n')
         assert expected_prompt_line in saved_content
 
+    def test_reset_config_does_not_mutate_given_config(self, manager: ConfigManager):
+        """Testa que reset_config não altera o objeto AppConfig recebido."""
+        valid_dict = get_valid_config_dict()
+        config_obj = AppConfig(**valid_dict)
+        manager.config_path.write_text(tomlkit.dumps(valid_dict), encoding="utf-8")
+        original_llm = config_obj.llm
+
+        manager.reset_config(config_obj, ['llm'])
+
+        assert config_obj.llm is original_llm
+        assert config_obj.llm.model_repo_id == valid_dict["llm"]["model_repo_id"]
+
     def test_reset_config_invalid_section(self, manager: ConfigManager):
         """Testa reset_config com um nome de seção inválido."""
         config_file = manager.config_path
@@ -0,0 +1,17 @@
+from src.config.config_utils import check_config_changes
+from src.config.models import AppConfig
+
+
+def test_check_config_changes_no_changes():
+    """Testa que configurações iguais não retornam seções alteradas."""
+    assert check_config_changes(AppConfig(), AppConfig()) == []
+
+
+def test_check_config_changes_returns_changed_sections_in_order():
+    """Testa que apenas as seções alteradas são retornadas, na ordem dos campos do AppConfig."""
+    current_config = AppConfig()
+    new_config = current_config.model_copy(deep=True)
+    new_config.llm.temperature = 1.5
+    new_config.system.storage_base_path = "outro/caminho"
+
+    assert check_config_changes(current_config, new_config) == ["system", "llm"]
@@ -249,6 +249,21 @@ class TestDataIngestionOrchestrator:
         assert orch._is_duplicate(None, mock_conn) is False
         assert orch._is_duplicate("", mock_conn) is False
 
+    def test_registered_hash_is_found_without_db_query(self, configured_orchestrator):
+        """Testa que hashes registrados na sessão são encontrados sem consultar o banco."""
+        orch = configured_orchestrator
+        mock_conn = MagicMock()
+
+        orch.document_hashes = {}
+        orch._register_document_hash("file1.pdf", "registered_hash")
+
+        assert orch.document_hashes == {"file1.pdf": "registered_hash"}
+        assert orch._is_duplicate("registered_hash", mock_conn) is True
+        original = orch._find_original_document("registered_hash", mock_conn)
+        assert original.name == "file1.pdf"
+        assert original.hash == "registered_hash"
+        mock_conn.execute.assert_not_called()
+
     def test_process_directory_with_valid_pdfs(
         self, configured_orchestrator, mocked_managers, mocker, domain_fixture
     ):
@@ -0,0 +1,33 @@
+import pytest
+
+from langchain.schema import Document
+
+from src.config.models import AppConfig
+from src.data_ingestion.chunking_strategy.semantic_cluster_strategy import SemanticClusterStrategy
+from src.models import DocumentFile
+
+
+class TestSemanticClusterStrategy:
+    """Suite de testes para a classe SemanticClusterStrategy."""
+
+    @pytest.fixture
+    def strategy(self) -> SemanticClusterStrategy:
+        """Fornece uma estratégia com a configuração padrão; os modelos só são carregados no primeiro uso."""
+        return SemanticClusterStrategy(AppConfig(), log_domain="test")
+
+    def test_create_chunks_rejects_file_with_only_empty_pages(self, strategy: SemanticClusterStrategy, mocker):
+        """Testa que um arquivo com páginas sem texto é rejeitado, sem gerar chunks nem carregar o modelo."""
+        load_model = mocker.patch("src.data_ingestion.chunking_strategy.chunking_strategy.get_sentence_transformer")
+        file = DocumentFile(
+            id=1,
+            hash="hash",
+            name="escaneado.pdf",
+            path="/fake/escaneado.pdf",
+            total_pages=2,
+            pages=[Document(page_content="", metadata={"page": 0}), Document(page_content="", metadata={"page": 1})],
+        )
+
+        with pytest.raises(ValueError):
+            strategy.create_chunks(file)
+
+        load_model.assert_not_called()
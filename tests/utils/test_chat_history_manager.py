@@ -0,0 +1,96 @@
+import sqlite3
+import pytest
+
+from src.utils.chat_history_manager import ChatHistoryManager
+from src.config.models import SystemConfig
+
+
+class TestChatHistoryManager:
+    """Test suite for ChatHistoryManager class."""
+
+    @pytest.fixture
+    def manager(self, tmp_path) -> ChatHistoryManager:
+        """Fornece um ChatHistoryManager isolado em um diretório temporário."""
+        config = SystemConfig(storage_base_path=str(tmp_path / "storage"), control_db_filename="control.db")
+        return ChatHistoryManager(config)
+
+    def test_init_creates_database_in_wal_mode(self, manager: ChatHistoryManager):
+        """Testa que o banco de dados é criado com a tabela chat_history em modo WAL."""
+        with manager.get_connection() as conn:
+            journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            table = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='chat_history'").fetchone()
+
+        assert journal_mode == "wal"
+        assert table is not None
+
+    def test_append_and_get_recent_messages_in_order(self, manager: ChatHistoryManager):
+        """Testa que as mensagens são recuperadas em ordem cronológica."""
+        manager.append_message("session-1", "user", "Pergunta")
+        manager.append_message("session-1", "assistant", "Resposta")
+
+        messages = manager.get_recent_messages("session-1", limit=10)
+
+        assert messages == [
+            {"role": "user", "content": "Pergunta"},
+            {"role": "assistant", "content": "Resposta"},
+        ]
+
+    def test_get_recent_messages_respects_limit(self, manager: ChatHistoryManager):
+        """Testa que apenas as últimas 'limit' mensagens são retornadas."""
+        for i in range(5):
+            manager.append_message("session-1", "user", f"mensagem {i}")
+
+        messages = manager.get_recent_messages("session-1", limit=2)
+
+        assert [message["content"] for message in messages] == ["mensagem 3", "mensagem 4"]
+
+    def test_sessions_are_isolated(self, manager: ChatHistoryManager):
+        """Testa que o histórico de uma sessão não aparece em outra."""
+        manager.append_message("session-1", "user", "da sessão 1")
+        manager.append_message("session-2", "user", "da sessão 2")
+
+        assert manager.get_recent_messages("session-1", limit=10) == [{"role": "user", "content": "da sessão 1"}]
+        assert manager.get_recent_messages("session-3", limit=10) == []
+
+    def test_delete_session(self, manager: ChatHistoryManager):
+        """Testa que delete_session remove apenas o histórico da sessão indicada."""
+        manager.append_message("session-1", "user", "mensagem")
+        manager.append_message("session-2", "user", "mensagem")
+
+        manager.delete_session("session-1")
+
+        assert manager.get_recent_messages("session-1", limit=10) == []
+        assert len(manager.get_recent_messages("session-2", limit=10)) == 1
+
+    def test_append_message_caps_messages_per_session(self, manager: ChatHistoryManager, mocker):
+        """Testa que apenas as últimas MAX_MESSAGES_PER_SESSION mensagens da sessão são mantidas."""
+        mocker.patch.object(ChatHistoryManager, "MAX_MESSAGES_PER_SESSION", 3)
+        for i in range(5):
+            manager.append_message("session-1", "user", f"mensagem {i}")
+        manager.append_message("session-2", "user", "outra sessão")
+
+        with manager.get_connection() as conn:
+            contents = [row[0] for row in conn.execute("SELECT content FROM chat_history WHERE session_id = 'session-1' ORDER BY id")]
+
+        assert contents == ["mensagem 2", "mensagem 3", "mensagem 4"]
+        assert len(manager.get_recent_messages("session-2", limit=10)) == 1
+
+    def test_append_message_removes_expired_messages(self, manager: ChatHistoryManager):
+        """Testa que mensagens mais antigas que RETENTION_DAYS são removidas ao inserir uma nova."""
+        with manager.get_connection() as conn:
+            conn.execute(
+                "INSERT INTO chat_history (session_id, role, content, created_at) VALUES (?, ?, ?, datetime('now', ?))",
+                ("session-old", "user", "antiga", f"-{ChatHistoryManager.RETENTION_DAYS + 1} days")
+            )
+
+        manager.append_message("session-1", "user", "nova")
+
+        assert manager.get_recent_messages("session-old", limit=10) == []
+        assert manager.get_recent_messages("session-1", limit=10) == [{"role": "user", "content": "nova"}]
+
+    def test_append_message_sqlite_error(self, manager: ChatHistoryManager, mocker):
+        """Testa que erros do SQLite são propagados."""
+        mocker.patch.object(manager, "get_connection", side_effect=sqlite3.OperationalError("disk I/O error"))
+
+        with pytest.raises(sqlite3.OperationalError):
+            manager.append_message("session-1", "user", "mensagem")
@@ -108,6 +108,26 @@ class TestLogger:
             except (json.JSONDecodeError, IndexError) as e:
                 pytest.fail(f"Failed to parse log entry: {e}, line content: {lines[1] if len(lines) > 1 else 'No line'}")
 
+    def test_disabled_level_skips_formatting(self, mocker):
+        """Test that messages below the configured level are not formatted."""
+        setup_logging(log_dir=self.test_log_dir, debug=False)
+        logger = get_logger("test_disabled_level", log_domain="test")
+        format_spy = mocker.spy(logger, "_format_message")
+
+        logger.debug("Debug message", detail="x")
+        assert format_spy.call_count == 0
+
+        logger.info("Info message")
+        assert format_spy.call_count == 1
+
+    def test_is_enabled_for(self):
+        """Test that is_enabled_for reflects the configured level."""
+        setup_logging(log_dir=self.test_log_dir, debug=False)
+        logger = get_logger("test_is_enabled_for", log_domain="test")
+
+        assert logger.is_enabled_for(logging.INFO)
+        assert not logger.is_enabled_for(logging.DEBUG)
+
     def test_logger_file_rotation(self):
         """Test that log files are rotated when they reach the size limit."""
         # Configure logger with a very small max file size to force rotation
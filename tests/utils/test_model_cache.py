@@ -0,0 +1,27 @@
+import pytest
+from src.utils.model_cache import get_sentence_transformer
+
+
+class TestModelCache:
+
+    @pytest.fixture(autouse=True)
+    def mock_sentence_transformer(self, mocker):
+        """Substitui o SentenceTransformer e limpa o cache antes e depois de cada teste."""
+        get_sentence_transformer.cache_clear()
+        mock_st_class = mocker.patch('src.utils.model_cache.SentenceTransformer', side_effect=lambda *args, **kwargs: mocker.MagicMock())
+        yield mock_st_class
+        get_sentence_transformer.cache_clear()
+
+    def test_same_model_and_device_loads_once(self, mock_sentence_transformer):
+        first = get_sentence_transformer("sentence-transformers/all-MiniLM-L6-v2", "cpu")
+        second = get_sentence_transformer("sentence-transformers/all-MiniLM-L6-v2", "cpu")
+
+        assert first is second
+        mock_sentence_transformer.assert_called_once_with("sentence-transformers/all-MiniLM-L6-v2", device="cpu")
+
+    def test_different_device_loads_new_instance(self, mock_sentence_transformer):
+        cpu_model = get_sentence_transformer("sentence-transformers/all-MiniLM-L6-v2", "cpu")
+        cuda_model = get_sentence_transformer("sentence-transformers/all-MiniLM-L6-v2", "cuda")
+
+        assert cpu_model is not cuda_model
+        assert mock_sentence_transformer.call_count == 2